@@ -4,12 +4,40 @@ Serves portfolio data to the Apoena Wealth dashboard
 """
 
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from src.portfolio_aggregator import PortfolioAggregator
 from datetime import datetime
 import os
 
+# orjson is an optional, faster encoder for API responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Encodes responses with orjson
+
+    Keys stay sorted and dates keep Flask's format (they are passed through to
+    the default handler); NumPy values are encoded natively and NaN becomes null.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=(orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME)
+        ).decode('utf-8')
+
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for cross-origin requests from the website
 
 # Initialize portfolio aggregator
@@ -46,7 +74,7 @@ def index():
         'endpoints': {
             # Portfolio endpoints
             '/api/portfolio/summary': 'Get consolidated portfolio summary',
-            '/api/portfolio/positions': 'Get all positions',
+            '/api/portfolio/positions': 'Get all positions (params: types)',
             '/api/portfolio/stocks': 'Get stock portfolio data',
             '/api/portfolio/crypto': 'Get crypto portfolio data',
             '/api/portfolio/bonds': 'Get bond portfolio data',
@@ -59,7 +87,7 @@ def index():
             '/api/portfolio/comparison': 'Compare portfolio to benchmark (params: benchmark, start_date, end_date)',
 
             # Historical data management
-            '/api/historical/initialize': 'Initialize historical data (POST: start_date, batch_days)',
+            '/api/historical/initialize': 'Initialize historical data (POST: start_date, batch_days, max_workers)',
             '/api/historical/stats': 'Get historical database statistics',
 
             # Fund accounting endpoints
@@ -91,7 +119,7 @@ def get_summary():
         summary = p.get_consolidated_summary(base_currency=base_currency)
         return jsonify({
             'success': True,
-            'data': summary,
+            'data': summary.to_dict(),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -105,8 +133,11 @@ def get_summary():
 def get_positions():
     """Get all positions across all asset types"""
     try:
+        types_str = request.args.get('types', '')
+        asset_types = [t.strip() for t in types_str.split(',') if t.strip()] or None
+
         p = get_portfolio()
-        positions = p.get_all_positions()
+        positions = p.get_all_positions(asset_types=asset_types)
         return jsonify({
             'success': True,
             'data': positions,
@@ -305,11 +336,13 @@ def initialize_historical_data():
         data = request.get_json() or {}
         start_date = data.get('start_date', '2020-01-01')
         batch_days = data.get('batch_days', 90)
+        max_workers = data.get('max_workers', 8)
 
         p = get_portfolio()
         stats = p.initialize_historical_data(
             start_date=start_date,
-            batch_days=batch_days
+            batch_days=batch_days,
+            max_workers=max_workers
         )
 
         return jsonify({
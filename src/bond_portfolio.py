@@ -8,6 +8,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List
 from .market_data import MarketDataFetcher
+from .frame_cache import cached_frame, _source_mtime
+from .numeric_kernels import sum_value_pnl_cost
 
 
 class BondPortfolio:
@@ -33,11 +35,32 @@ class BondPortfolio:
         self.market_data = market_data or MarketDataFetcher()
 
         # Load all bond types
-        self.bonds = self._load_all_bonds()
+        self._load_bonds()
 
         # Get IPCA data
         self.ipca_data = None
 
+    def _load_bonds(self):
+        """Load all bond files, remembering the directory's modification time"""
+        self._bonds_mtime = _source_mtime(self.bonds_dir)
+        self.bonds = self._load_all_bonds()
+
+    def bonds_changed(self) -> bool:
+        """Whether a bond file changed since the bonds were loaded"""
+        return _source_mtime(self.bonds_dir) != self._bonds_mtime
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the bonds if a bond file changed since they were loaded
+
+        Returns:
+            True if the bonds were reloaded
+        """
+        if not self.bonds_changed():
+            return False
+        self._load_bonds()
+        return True
+
     def _load_all_bonds(self) -> pd.DataFrame:
         """Load all bond files and combine them"""
         bond_files = {
@@ -155,12 +178,12 @@ class BondPortfolio:
 
         return result
 
-    def _calculate_bond_value(self, bond: pd.Series, valuation_date: pd.Timestamp = None) -> Dict:
+    def _calculate_bond_value(self, bond: Dict, valuation_date: pd.Timestamp = None) -> Dict:
         """
         Calculate current value of a bond
 
         Args:
-            bond: Bond row from DataFrame
+            bond: Bond record (row of the bonds DataFrame as a dictionary)
             valuation_date: Date to value the bond (default: today)
 
         Returns:
@@ -243,6 +266,120 @@ class BondPortfolio:
             'P&L %': unrealized_pnl_pct
         }
 
+    def _ipca_adjustments(self, base_value: float, start_date: pd.Timestamp,
+                          end_dates: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Calculate IPCA adjustment from one start date to each of several end dates
+
+        Same as _calculate_ipca_adjustment, with the cumulative IPCA product
+        taken once and looked up per end date.
+
+        Args:
+            base_value: Initial value
+            start_date: Start date
+            end_dates: End dates
+
+        Returns:
+            Array of adjusted values aligned with end_dates
+        """
+        ipca = self._load_ipca_data()
+
+        if ipca is None or ipca.empty:
+            print("Warning: IPCA data not available, using 5% annual approximation")
+            years = (end_dates - start_date).days.to_numpy() / 365.25
+            return base_value * (1.05 ** years)  # Approximate 5% annual
+
+        # Monthly IPCA percentages as growth factors, in date order
+        order = np.argsort(ipca['Date'].to_numpy(dtype='datetime64[ns]'), kind='stable')
+        ipca_dates = ipca['Date'].to_numpy(dtype='datetime64[ns]')[order]
+        factors = 1 + ipca['IPCA'].to_numpy(dtype=np.float64)[order] / 100
+
+        # Months from the start date onwards, and how many fall on or before each end date
+        first = np.searchsorted(ipca_dates, np.datetime64(start_date, 'ns'), side='left')
+        counts = np.searchsorted(ipca_dates, end_dates.values, side='right') - first
+
+        cumulative_factors = np.cumprod(factors[first:])
+        if len(cumulative_factors) == 0:
+            return np.full(len(end_dates), base_value, dtype=np.float64)
+
+        adjusted = base_value * cumulative_factors[np.clip(counts - 1, 0, None)]
+        return np.where(counts > 0, adjusted, base_value)
+
+    def _bond_values_over_time(self, bond: Dict, dates: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Calculate a bond's current value on each of several dates
+
+        Mirrors the valuation in _calculate_bond_value with the dates as an array.
+
+        Args:
+            bond: Bond record (row of the bonds DataFrame as a dictionary)
+            dates: Valuation dates
+
+        Returns:
+            Array of values aligned with dates
+        """
+        valor_investido = bond.get('Valor investido ', 0)
+        data_aplicacao = bond.get('Data de Aplicação / Resgate')
+        index_info = self._parse_indexador(
+            bond.get('Indexador', 'Prefixado'),
+            bond.get('Percentual Indexado ', '0%')
+        )
+
+        # Every indexed valuation accrues from the application date
+        if pd.isna(data_aplicacao):
+            return np.full(len(dates), valor_investido, dtype=np.float64)
+
+        start_date = pd.Timestamp(data_aplicacao)
+        years = (dates - start_date).days.to_numpy() / 365.25
+
+        if index_info['type'] in ['IPCA', 'NTN-B']:
+            values = self._ipca_adjustments(valor_investido, start_date, dates)
+            # Add fixed rate component (compounded annually)
+            if index_info['rate'] > 0:
+                values = values * (1 + index_info['rate'] / 100) ** years
+            return values
+
+        if index_info['type'] in ['CDI', 'SELIC', 'LFT']:
+            # Approximate CDI at 13.75% p.a., SELIC at 11.75% p.a.
+            base_rate = 13.75 if index_info['type'] == 'CDI' else 11.75
+            total_rate = base_rate * (index_info['rate'] / 100) if index_info['rate'] > 0 else base_rate
+            return valor_investido * ((1 + total_rate / 100) ** years)
+
+        if index_info['type'] in ['PREFIXADO', 'LTN'] and index_info['rate'] > 0:
+            return valor_investido * ((1 + index_info['rate'] / 100) ** years)
+
+        return np.full(len(dates), valor_investido, dtype=np.float64)
+
+    def get_values_over_time(self, dates: pd.DatetimeIndex) -> pd.Series:
+        """
+        Get the total value of all bonds on each of several dates
+
+        Equivalent to summing get_current_values(valuation_date=date)['Valor Atual']
+        for every date, with each bond valued over all dates at once.
+
+        Args:
+            dates: Valuation dates
+
+        Returns:
+            Series of total bond value indexed by date
+        """
+        dates = pd.DatetimeIndex(dates)
+        totals = np.zeros(len(dates))
+
+        if self.bonds.empty:
+            return pd.Series(totals, index=dates)
+
+        for bond in self.bonds.to_dict('records'):
+            # Zero quantity positions are filtered out of current values too
+            if bond.get('Quantidade', 0) == 0:
+                continue
+
+            values = self._bond_values_over_time(bond, dates)
+            totals += np.where(np.isnan(values), 0.0, values)
+
+        return pd.Series(totals, index=dates)
+
+    @cached_frame('bonds_dir')
     def get_current_values(self, valuation_date: pd.Timestamp = None) -> pd.DataFrame:
         """
         Get current values of all bonds
@@ -256,13 +393,11 @@ class BondPortfolio:
         if self.bonds.empty:
             return pd.DataFrame()
 
-        results = []
-
-        for _, bond in self.bonds.iterrows():
-            valuation = self._calculate_bond_value(bond, valuation_date)
-            results.append(valuation)
-
-        df = pd.DataFrame(results)
+        # Plain records instead of one Series per row (iterrows)
+        df = pd.DataFrame([
+            self._calculate_bond_value(bond, valuation_date)
+            for bond in self.bonds.to_dict('records')
+        ])
 
         # Filter out zero quantity positions
         df = df[df['Quantidade'] != 0]
@@ -286,9 +421,12 @@ class BondPortfolio:
             return {
                 'total_invested': 0,
                 'total_current_value': 0,
+                'total_market_value': 0,
+                'total_cost_basis': 0,
                 'total_pnl': 0,
                 'total_return_pct': 0,
                 'num_bonds': 0,
+                'num_positions': 0,
                 'bonds_maturing_30days': 0,
                 'bonds_maturing_90days': 0
             }
@@ -298,12 +436,19 @@ class BondPortfolio:
         bonds_30days = len(active_bonds[active_bonds['Dias até Vencimento'] <= 30]) if not active_bonds.empty else 0
         bonds_90days = len(active_bonds[active_bonds['Dias até Vencimento'] <= 90]) if not active_bonds.empty else 0
 
+        total_current_value, total_pnl, total_invested = sum_value_pnl_cost(
+            df['Valor Atual'], df['P&L'], df['Valor Investido']
+        )
+
         return {
-            'total_invested': df['Valor Investido'].sum(),
-            'total_current_value': df['Valor Atual'].sum(),
-            'total_pnl': df['P&L'].sum(),
-            'total_return_pct': (df['P&L'].sum() / df['Valor Investido'].sum() * 100) if df['Valor Investido'].sum() > 0 else 0,
+            'total_invested': total_invested,
+            'total_current_value': total_current_value,
+            'total_market_value': total_current_value,
+            'total_cost_basis': total_invested,
+            'total_pnl': total_pnl,
+            'total_return_pct': (total_pnl / total_invested * 100) if total_invested > 0 else 0,
             'num_bonds': len(df),
+            'num_positions': len(df),
             'num_active_bonds': len(active_bonds),
             'bonds_maturing_30days': bonds_30days,
             'bonds_maturing_90days': bonds_90days
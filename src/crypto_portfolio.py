@@ -3,11 +3,17 @@ Cryptocurrency Portfolio Calculator
 Handles crypto tracking with P&L and multi-currency support
 """
 
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from typing import Dict, List
 from .market_data import MarketDataFetcher
+from .frame_cache import cached_frame
+from .numeric_kernels import position_cost_basis, sum_value_pnl_cost
+
+# Column types for the orders CSV (symbols repeat, so they are categorical)
+ORDER_DTYPES = {'Ativo': 'category', 'Preço': 'float64', 'Quantidade': 'float64'}
 
 
 class CryptoPortfolio:
@@ -27,80 +33,102 @@ class CryptoPortfolio:
             orders_file: Path to CSV file with crypto orders
             market_data: MarketDataFetcher instance (optional)
         """
-        self.orders = pd.read_csv(orders_file)
-        self.orders['Data'] = pd.to_datetime(self.orders['Data'])
-        self.orders = self.orders.sort_values('Data')
+        self.orders_file = orders_file
+        self._load_orders()
 
         self.market_data = market_data or MarketDataFetcher()
 
         # Process orders to build positions
         self.positions = {}
+        self._positions_mtime = None
+
+    def _load_orders(self):
+        """Load orders from CSV, remembering the file's modification time"""
+        self._orders_mtime = os.path.getmtime(self.orders_file)
+        self.orders = pd.read_csv(self.orders_file, dtype=ORDER_DTYPES, parse_dates=['Data'])
+        self.orders = self.orders.sort_values('Data')
+
+    def orders_changed(self) -> bool:
+        """Whether the orders file changed since the orders were loaded"""
+        return os.path.getmtime(self.orders_file) != self._orders_mtime
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the orders if the orders file changed since it was read
+
+        Returns:
+            True if the orders were reloaded
+        """
+        if not self.orders_changed():
+            return False
+        self._load_orders()
+        return True
+
+    def _get_yahoo_symbol(self, symbol: str) -> str:
+        """
+        Convert symbol to Yahoo Finance format
+
+        Args:
+            symbol: Crypto symbol (e.g., 'BTC' or 'BTC-USD')
+
+        Returns:
+            Yahoo Finance formatted symbol (quoted in USD)
+        """
+        return symbol if symbol.endswith('-USD') else f"{symbol}-USD"
+
+    def positions_fresh(self) -> bool:
+        """Whether positions were calculated from the current orders file"""
+        return bool(self.positions) and self._positions_mtime == os.path.getmtime(self.orders_file)
 
     def calculate_positions(self) -> Dict:
         """
         Calculate current positions from orders
 
+        Orders are reloaded first if the orders file changed since it was read.
+
         Returns:
             Dictionary with position details per symbol
         """
+        self.reload_if_changed()
+
+        # One position per symbol, in order of first trade
+        ids, symbols = pd.factorize(self.orders['Ativo'])
+        dates = self.orders['Data'].to_numpy(dtype='datetime64[ns]')
+        prices = self.orders['Preço'].to_numpy(dtype=np.float64)
+        quantities = self.orders['Quantidade'].to_numpy(dtype=np.float64)
+
+        quantity, avg_cost, invested, realized, holdings = position_cost_basis(
+            ids, prices, quantities, len(symbols)
+        )
+
+        # Order rows grouped by position, keeping date order within each
+        order = np.argsort(ids, kind='stable')
+        bounds = np.searchsorted(ids[order], np.arange(len(symbols) + 1))
+
         positions = {}
 
-        for _, order in self.orders.iterrows():
-            symbol = order['Ativo']
-            date = order['Data']
-            price = float(order['Preço'])
-            quantity = float(order['Quantidade'])
-
-            if symbol not in positions:
-                positions[symbol] = {
-                    'symbol': symbol,
-                    'quantity': 0,
-                    'avg_cost': 0,
-                    'total_invested': 0,
-                    'realized_pnl': 0,
-                    'transactions': []
-                }
-
-            pos = positions[symbol]
-
-            # Buy transaction (positive quantity)
-            if quantity > 0:
-                # Update average cost
-                old_value = pos['quantity'] * pos['avg_cost']
-                new_value = quantity * price
-                total_quantity = pos['quantity'] + quantity
-
-                if total_quantity > 0:
-                    pos['avg_cost'] = (old_value + new_value) / total_quantity
-
-                pos['quantity'] += quantity
-                pos['total_invested'] += (quantity * price)
-
-            # Sell transaction (negative quantity)
-            else:
-                sell_quantity = abs(quantity)
-                sell_price = price
-
-                # Calculate realized P&L
-                cost_basis = sell_quantity * pos['avg_cost']
-                proceeds = sell_quantity * sell_price
-                realized_pnl = proceeds - cost_basis
-
-                pos['realized_pnl'] += realized_pnl
-                pos['quantity'] += quantity  # quantity is negative
-                pos['total_invested'] -= cost_basis
-
-            # Record transaction
-            pos['transactions'].append({
-                'date': date,
-                'price': price,
-                'quantity': quantity,
-                'type': 'BUY' if quantity > 0 else 'SELL'
-            })
+        for i, symbol in enumerate(symbols):
+            rows = order[bounds[i]:bounds[i + 1]]
+
+            # Transactions as parallel arrays (buys have positive quantities),
+            # with the quantity held after each one
+            positions[symbol] = {
+                'symbol': symbol,
+                'quantity': float(quantity[i]),
+                'avg_cost': float(avg_cost[i]),
+                'total_invested': float(invested[i]),
+                'realized_pnl': float(realized[i]),
+                'txn_dates': dates[rows],
+                'txn_prices': prices[rows],
+                'txn_quantities': quantities[rows],
+                'txn_holdings': holdings[rows]
+            }
 
         self.positions = positions
+        self._positions_mtime = self._orders_mtime
         return positions
 
+    @cached_frame('orders_file', key_args=('currency',))
     def get_current_values(self, currency: str = 'BRL') -> pd.DataFrame:
         """
         Get current portfolio values with market prices
@@ -111,29 +139,33 @@ class CryptoPortfolio:
         Returns:
             DataFrame with position details and P&L
         """
-        if not self.positions:
+        if not self.positions_fresh():
             self.calculate_positions()
 
-        results = []
+        # Skip closed positions
+        open_positions = {symbol: pos for symbol, pos in self.positions.items() if pos['quantity'] != 0}
 
-        for symbol, pos in self.positions.items():
-            if pos['quantity'] == 0:
-                # Skip closed positions
-                continue
+        # Get current market prices (USD) in one concurrent batch
+        yahoo_symbols = {symbol: self._get_yahoo_symbol(symbol) for symbol in open_positions}
+        prices = self.market_data.get_current_prices(list(yahoo_symbols.values()))
 
-            # Get current market price
-            current_price = self.market_data.get_current_price(f"{symbol}-USD")
+        # Exchange rate is the same for every position, fetch it once
+        usd_brl = None
+        if currency == 'BRL' and any(price is not None for price in prices.values()):
+            usd_brl = self.market_data.get_exchange_rate('USD', 'BRL')
+
+        results = []
+
+        for symbol, pos in open_positions.items():
+            current_price = prices[yahoo_symbols[symbol]]
 
             if current_price is None:
                 print(f"Warning: Could not get price for {symbol}, using last trade price")
                 # Use last transaction price
-                current_price = pos['transactions'][-1]['price']
-            else:
+                current_price = float(pos['txn_prices'][-1])
+            elif usd_brl:
                 # Convert to desired currency if needed
-                if currency == 'BRL':
-                    usd_brl = self.market_data.get_exchange_rate('USD', 'BRL')
-                    if usd_brl:
-                        current_price *= usd_brl
+                current_price *= usd_brl
 
             # Calculate unrealized P&L
             market_value = pos['quantity'] * current_price
@@ -193,13 +225,17 @@ class CryptoPortfolio:
                 'currency': currency
             }
 
+        total_market_value, total_pnl, total_cost_basis = sum_value_pnl_cost(
+            df['Market Value'], df['Total P&L'], df['Cost Basis']
+        )
+
         return {
-            'total_market_value': df['Market Value'].sum(),
-            'total_cost_basis': df['Cost Basis'].sum(),
+            'total_market_value': total_market_value,
+            'total_cost_basis': total_cost_basis,
             'total_unrealized_pnl': df['Unrealized P&L'].sum(),
             'total_realized_pnl': df['Realized P&L'].sum(),
-            'total_pnl': df['Total P&L'].sum(),
-            'total_return_pct': (df['Total P&L'].sum() / df['Cost Basis'].sum() * 100) if df['Cost Basis'].sum() > 0 else 0,
+            'total_pnl': total_pnl,
+            'total_return_pct': (total_pnl / total_cost_basis * 100) if total_cost_basis > 0 else 0,
             'num_positions': len(df),
             'currency': currency
         }
@@ -214,30 +250,33 @@ class CryptoPortfolio:
         Returns:
             DataFrame with transaction history
         """
-        if not self.positions:
+        if not self.positions_fresh():
             self.calculate_positions()
 
-        transactions = []
+        positions_to_check = [self.positions[symbol]] if symbol else list(self.positions.values())
 
-        positions_to_check = [self.positions[symbol]] if symbol else self.positions.values()
+        if not positions_to_check:
+            return pd.DataFrame()
 
-        for pos in positions_to_check:
-            for txn in pos['transactions']:
-                transactions.append({
-                    'Date': txn['date'],
-                    'Symbol': pos['symbol'],
-                    'Type': txn['type'],
-                    'Quantity': abs(txn['quantity']),
-                    'Price': txn['price'],
-                    'Value': abs(txn['quantity'] * txn['price'])
-                })
+        # Concatenate the per-position transaction arrays into columns
+        counts = [len(pos['txn_dates']) for pos in positions_to_check]
+        prices = np.concatenate([pos['txn_prices'] for pos in positions_to_check])
+        quantities = np.concatenate([pos['txn_quantities'] for pos in positions_to_check])
 
-        df = pd.DataFrame(transactions)
+        df = pd.DataFrame({
+            'Date': np.concatenate([pos['txn_dates'] for pos in positions_to_check]),
+            'Symbol': np.repeat(np.array([pos['symbol'] for pos in positions_to_check], dtype=object), counts),
+            'Type': np.where(quantities > 0, 'BUY', 'SELL').astype(object),
+            'Quantity': np.abs(quantities),
+            'Price': prices,
+            'Value': np.abs(quantities * prices)
+        })
 
         if df.empty:
             return df
 
-        df = df.sort_values('Date', ascending=False)
+        # Stable, so same-day transactions keep their order
+        df = df.sort_values('Date', ascending=False, kind='mergesort')
 
         return df
 
@@ -0,0 +1,122 @@
+"""
+Frame Cache
+Short-lived disk snapshots of computed portfolio DataFrames
+"""
+
+import os
+import time
+import threading
+import hashlib
+import inspect
+import functools
+from datetime import datetime
+from typing import Callable, Tuple
+import pandas as pd
+
+# Feather needs pyarrow; fall back to pickle snapshots without it
+try:
+    import pyarrow  # noqa: F401
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+CACHE_DIR = 'data/cache/frames'
+
+
+def _source_mtime(path: str) -> float:
+    """Latest modification time of a file, or of the files inside a directory"""
+    if os.path.isdir(path):
+        return max(
+            (os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)),
+            default=0.0
+        )
+    return os.path.getmtime(path) if os.path.exists(path) else 0.0
+
+
+def _is_fresh(path: str, source: str, ttl: int) -> bool:
+    """Snapshot is younger than ttl, newer than its source and from today"""
+    if not os.path.exists(path):
+        return False
+
+    written_at = os.path.getmtime(path)
+
+    return (
+        time.time() - written_at < ttl
+        and written_at >= _source_mtime(source)
+        and datetime.fromtimestamp(written_at).date() == datetime.now().date()
+    )
+
+
+def _read_snapshot(path: str) -> pd.DataFrame:
+    if FEATHER_AVAILABLE:
+        return pd.read_feather(path)
+    return pd.read_pickle(path)
+
+
+def _write_snapshot(df: pd.DataFrame, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    if FEATHER_AVAILABLE:
+        df.to_feather(tmp_path)
+    else:
+        df.to_pickle(tmp_path)
+
+    os.replace(tmp_path, path)
+
+
+def cached_frame(source_attr: str, ttl: int = 60, key_args: Tuple[str, ...] = ()) -> Callable:
+    """
+    Cache a DataFrame-returning method on disk for a short time
+
+    One snapshot is kept per method and ``key_args`` values. It is reused while
+    it is younger than ``ttl``, newer than the instance's source file (or any
+    file in the source directory) and was written today. Calls passing any
+    other argument (e.g. an explicit valuation date) bypass the cache, since
+    only "current" snapshots are worth sharing. The returned frame always has
+    a fresh RangeIndex in its original row order.
+
+    Args:
+        source_attr: Instance attribute holding the orders file or directory
+        ttl: Snapshot lifetime in seconds
+        key_args: Argument names that select between different snapshots
+
+    Returns:
+        Method decorator
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        extension = 'feather' if FEATHER_AVAILABLE else 'pkl'
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != 'self'}
+
+            if any(value is not None for name, value in params.items() if name not in key_args):
+                return func(self, *args, **kwargs)
+
+            source = getattr(self, source_attr)
+            key = '|'.join([os.path.abspath(source)] + [f"{name}={params[name]}" for name in key_args])
+            digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+            path = os.path.join(CACHE_DIR, f"{type(self).__name__}.{func.__name__}.{digest}.{extension}")
+
+            if _is_fresh(path, source, ttl):
+                try:
+                    return _read_snapshot(path)
+                except Exception as e:
+                    print(f"Warning: Could not read cached {func.__name__}: {str(e)}")
+
+            df = func(self, *args, **kwargs).reset_index(drop=True)
+
+            try:
+                _write_snapshot(df, path)
+            except Exception as e:
+                print(f"Warning: Could not cache {func.__name__}: {str(e)}")
+
+            return df
+
+        return wrapper
+
+    return decorator
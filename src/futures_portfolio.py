@@ -319,22 +319,34 @@ class FuturesPortfolio:
         if values_df.empty:
             return {
                 'num_contracts': 0,
+                'num_positions': 0,
                 'total_notional': 0.0,
+                'total_market_value': 0.0,
+                'total_cost_basis': 0.0,
                 'total_unrealized_pnl': 0.0,
                 'total_realized_pnl': 0.0,
                 'total_commission': 0.0,
                 'total_pnl': 0.0,
+                'total_return_pct': 0.0,
                 'long_contracts': 0,
                 'short_contracts': 0
             }
 
+        # Futures are margined: exposure is the notional value and no capital
+        # is invested up front, so there is no cost basis to return on
+        total_notional = values_df['Notional Value'].sum()
+
         return {
             'num_contracts': len(values_df),
-            'total_notional': values_df['Notional Value'].sum(),
+            'num_positions': len(values_df),
+            'total_notional': total_notional,
+            'total_market_value': total_notional,
+            'total_cost_basis': 0.0,
             'total_unrealized_pnl': values_df['Unrealized P&L'].sum(),
             'total_realized_pnl': values_df['Realized P&L'].sum(),
             'total_commission': values_df['Commission'].sum(),
             'total_pnl': values_df['Total P&L'].sum(),
+            'total_return_pct': 0.0,
             'long_contracts': len(values_df[values_df['Side'] == 'long']),
             'short_contracts': len(values_df[values_df['Side'] == 'short'])
         }
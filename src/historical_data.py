@@ -8,6 +8,8 @@ import numpy as np
 import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 import os
 from .market_data import MarketDataFetcher
@@ -31,6 +33,10 @@ class HistoricalDataManager:
         """
         self.db_path = db_path
         self.market_data = MarketDataFetcher()
+
+        # Symbols are fetched from worker threads; SQLite takes one writer at a time
+        self._write_lock = threading.Lock()
+
         self._init_database()
 
     def _init_database(self):
@@ -223,6 +229,11 @@ class HistoricalDataManager:
         Returns:
             Number of records stored
         """
+        with self._write_lock:
+            return self._write_price_data(symbol, df)
+
+    def _write_price_data(self, symbol: str, df: pd.DataFrame) -> int:
+        """Insert price data and refresh symbol metadata (caller holds the write lock)"""
         conn = sqlite3.connect(self.db_path)
 
         # Prepare data for insertion
@@ -309,6 +320,49 @@ class HistoricalDataManager:
 
         return df
 
+    def get_historical_data_batch(
+        self,
+        symbols: List[str],
+        start_date: str = None,
+        end_date: str = None
+    ) -> pd.DataFrame:
+        """
+        Retrieve closing prices for several symbols in one query
+
+        Args:
+            symbols: Symbols to retrieve
+            start_date: Start date (optional)
+            end_date: End date (optional)
+
+        Returns:
+            DataFrame of closes indexed by date, one column per symbol
+            (all NaN for symbols without data)
+        """
+        if not symbols:
+            return pd.DataFrame()
+
+        conn = sqlite3.connect(self.db_path)
+
+        placeholders = ', '.join('?' * len(symbols))
+        query = f'SELECT symbol, date, close FROM price_history WHERE symbol IN ({placeholders})'
+        params = list(symbols)
+
+        if start_date:
+            query += ' AND date >= ?'
+            params.append(start_date)
+
+        if end_date:
+            query += ' AND date <= ?'
+            params.append(end_date)
+
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+
+        df['date'] = pd.to_datetime(df['date'])
+        closes = df.pivot(index='date', columns='symbol', values='close').sort_index()
+
+        return closes.reindex(columns=list(symbols)).astype(float)
+
     def get_latest_price(self, symbol: str) -> Optional[float]:
         """Get most recent price for a symbol"""
         conn = sqlite3.connect(self.db_path)
@@ -333,23 +387,54 @@ class HistoricalDataManager:
         symbols: List[str],
         start_date: str,
         end_date: str = None,
-        batch_days: int = 100
+        batch_days: int = 100,
+        max_workers: int = 8
     ):
         """
         Fetch historical data for multiple symbols
 
+        Symbols are split into up to max_workers slices that are fetched
+        concurrently (the work is network-bound); each slice keeps the
+        per-symbol rate limiting.
+
         Args:
             symbols: List of symbols
             start_date: Start date
             end_date: End date
             batch_days: Days per batch
+            max_workers: Maximum number of symbols fetched at the same time
         """
         print(f"\n{'='*60}")
         print(f"Bulk fetching {len(symbols)} symbols")
         print(f"{'='*60}\n")
 
-        for i, symbol in enumerate(symbols, 1):
-            print(f"[{i}/{len(symbols)}] {symbol}")
+        numbered = list(enumerate(symbols, 1))
+        num_slices = max(1, min(max_workers, len(numbered)))
+        slices = [numbered[i::num_slices] for i in range(num_slices)]
+
+        with ThreadPoolExecutor(max_workers=num_slices) as executor:
+            for _ in executor.map(
+                lambda symbol_slice: self._fetch_slice(symbol_slice, len(symbols), start_date,
+                                                       end_date, batch_days),
+                slices
+            ):
+                pass
+
+        print(f"\n{'='*60}")
+        print("Bulk fetch complete!")
+        print(f"{'='*60}\n")
+
+    def _fetch_slice(
+        self,
+        numbered_symbols: List[Tuple[int, str]],
+        total: int,
+        start_date: str,
+        end_date: str,
+        batch_days: int
+    ):
+        """Fetch one bulk_fetch slice of (position, symbol) pairs sequentially"""
+        for n, (i, symbol) in enumerate(numbered_symbols, 1):
+            print(f"[{i}/{total}] {symbol}")
             try:
                 self.fetch_historical_data(symbol, start_date, end_date,
                                           batch_days=batch_days)
@@ -357,13 +442,9 @@ class HistoricalDataManager:
                 print(f"  ✗ Error: {str(e)}")
 
             # Rate limiting between symbols
-            if i < len(symbols):
+            if n < len(numbered_symbols):
                 time.sleep(1)  # 1 second between symbols
 
-        print(f"\n{'='*60}")
-        print("Bulk fetch complete!")
-        print(f"{'='*60}\n")
-
     def get_database_stats(self) -> Dict:
         """Get statistics about stored data"""
         conn = sqlite3.connect(self.db_path)
@@ -390,19 +390,19 @@ class IBKRDataFetcherMock:
         """
         dates = pd.date_range(start=start_date, end=end_date, freq='D')
 
-        # Generate random walk prices
-        np.random.seed(hash(symbol) % 2**32)
+        # Generate random walk prices (local generator: safe to call from threads)
+        rng = np.random.RandomState(hash(symbol) % 2**32)
         base_price = 100.0 if contract_type == 'future' else 5.0
-        returns = np.random.normal(0.0001, 0.02, len(dates))
+        returns = rng.normal(0.0001, 0.02, len(dates))
         prices = base_price * np.exp(np.cumsum(returns))
 
         df = pd.DataFrame({
             'date': dates,
-            'open': prices * (1 + np.random.uniform(-0.01, 0.01, len(dates))),
-            'high': prices * (1 + np.random.uniform(0, 0.02, len(dates))),
-            'low': prices * (1 + np.random.uniform(-0.02, 0, len(dates))),
+            'open': prices * (1 + rng.uniform(-0.01, 0.01, len(dates))),
+            'high': prices * (1 + rng.uniform(0, 0.02, len(dates))),
+            'low': prices * (1 + rng.uniform(-0.02, 0, len(dates))),
             'close': prices,
-            'volume': np.random.randint(1000, 10000, len(dates))
+            'volume': rng.randint(1000, 10000, len(dates))
         })
 
         return df
@@ -421,13 +421,14 @@ class IBKRDataFetcherMock:
         """
         # Simplified approximations
         time_to_expiry = days_to_expiry / 365.0
+        rng = np.random.RandomState(hash((symbol, strike, days_to_expiry)) % 2**32)
 
         return {
-            'delta': 0.5 + np.random.uniform(-0.3, 0.3),
+            'delta': 0.5 + rng.uniform(-0.3, 0.3),
             'gamma': 0.05 * np.exp(-time_to_expiry),
             'theta': -0.01 * strike / time_to_expiry if time_to_expiry > 0 else 0,
             'vega': 0.1 * strike * np.sqrt(time_to_expiry),
-            'implied_vol': 0.20 + np.random.uniform(-0.05, 0.05)
+            'implied_vol': 0.20 + rng.uniform(-0.05, 0.05)
         }
 
     def get_current_price(self, symbol: str, contract_type: str) -> float:
@@ -441,9 +442,9 @@ class IBKRDataFetcherMock:
         Returns:
             Simulated price
         """
-        np.random.seed(hash(symbol) % 2**32)
+        rng = np.random.RandomState(hash(symbol) % 2**32)
         base = 100.0 if contract_type == 'future' else 5.0
-        return base * (1 + np.random.uniform(-0.1, 0.1))
+        return base * (1 + rng.uniform(-0.1, 0.1))
 
 
 def test_ibkr_connection():
@@ -2,12 +2,20 @@
 Market Data Module - Fetches stock, crypto, and economic data
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import json
 
+# Seconds to wait for a data provider before giving up on a request
+REQUEST_TIMEOUT = 15
+
+# Concurrent requests when fetching current prices for several symbols
+PRICE_FETCH_WORKERS = 8
+
 
 class MarketDataFetcher:
     """Fetches market data from various sources"""
@@ -16,6 +24,17 @@ class MarketDataFetcher:
         self.yahoo_base_url = "https://query1.finance.yahoo.com/v8/finance/chart/"
         self.bacen_base_url = "https://api.bcb.gov.br/dados/serie/bcdata.sgs"
 
+        # Portfolios are valued from worker threads and requests.Session is not
+        # thread-safe, so each thread keeps its own pooled session
+        self._local = threading.local()
+
+    def _get(self, url: str, params: Dict = None) -> requests.Response:
+        """GET through the calling thread's HTTP session (keeps connections alive)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
         Fetch stock data from Yahoo Finance
@@ -49,7 +68,7 @@ class MarketDataFetcher:
                 'events': 'div,split'
             }
 
-            response = requests.get(url, params=params)
+            response = self._get(url, params=params)
 
             if response.status_code != 200:
                 print(f"Warning: Could not fetch data for {symbol}. Status: {response.status_code}")
@@ -118,6 +137,26 @@ class MarketDataFetcher:
             print(f"Error getting current price for {symbol}: {str(e)}")
             return None
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Get current prices for several symbols, fetched concurrently
+
+        Args:
+            symbols: Symbols to price (duplicates are fetched once)
+
+        Returns:
+            Dictionary of price (or None if not available) by symbol
+        """
+        symbols = list(dict.fromkeys(symbols))
+
+        if len(symbols) <= 1:
+            return {symbol: self.get_current_price(symbol) for symbol in symbols}
+
+        with ThreadPoolExecutor(max_workers=min(PRICE_FETCH_WORKERS, len(symbols))) as executor:
+            prices = list(executor.map(self.get_current_price, symbols))
+
+        return dict(zip(symbols, prices))
+
     def get_crypto_data(self, symbol: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
         Fetch cryptocurrency data from Yahoo Finance
@@ -167,7 +206,7 @@ class MarketDataFetcher:
             if end_date:
                 params['dataFinal'] = end_date
 
-            response = requests.get(url, params=params)
+            response = self._get(url, params=params)
 
             if response.status_code != 200:
                 print(f"Warning: Could not fetch IPCA data. Status: {response.status_code}")
@@ -215,7 +254,7 @@ class MarketDataFetcher:
             if end_date:
                 params['dataFinal'] = end_date
 
-            response = requests.get(url, params=params)
+            response = self._get(url, params=params)
 
             if response.status_code != 200:
                 print(f"Warning: Could not fetch SELIC data. Status: {response.status_code}")
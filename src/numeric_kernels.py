@@ -0,0 +1,284 @@
+"""
+Numeric Kernels
+Single-pass reductions over float64 arrays, JIT-compiled with Numba when available
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Numba is optional: without it the NumPy implementations are used
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+
+def _as_float_array(values) -> np.ndarray:
+    """Contiguous float64 view of a Series/array (copies only if needed)"""
+    if hasattr(values, 'to_numpy'):
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _sum_value_pnl_cost_jit(values, pnls, costs):
+        total_value = 0.0
+        total_pnl = 0.0
+        total_cost = 0.0
+
+        for i in range(values.shape[0]):
+            # NaN-skipping like pandas .sum()
+            if values[i] == values[i]:
+                total_value += values[i]
+            if pnls[i] == pnls[i]:
+                total_pnl += pnls[i]
+            if costs[i] == costs[i]:
+                total_cost += costs[i]
+
+        return total_value, total_pnl, total_cost
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _group_sum_jit(values, ids, n_groups):
+        totals = np.zeros(n_groups)
+
+        for i in range(values.shape[0]):
+            # Skip missing keys (id -1) and NaN values like pandas groupby().sum()
+            if ids[i] >= 0 and values[i] == values[i]:
+                totals[ids[i]] += values[i]
+
+        return totals
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _running_peak_jit(values):
+        peaks = np.empty(values.shape[0])
+        peak = np.nan
+
+        for i in range(values.shape[0]):
+            # NaN values keep the previous peak, like pandas expanding().max()
+            if values[i] == values[i] and not values[i] <= peak:
+                peak = values[i]
+            peaks[i] = peak
+
+        return peaks
+
+
+def _position_cost_basis_loop(ids, prices, quantities, n_groups):
+    quantity = np.zeros(n_groups)
+    avg_cost = np.zeros(n_groups)
+    invested = np.zeros(n_groups)
+    realized = np.zeros(n_groups)
+    holdings = np.zeros(ids.shape[0])
+
+    for i in range(ids.shape[0]):
+        g = ids[i]
+        if g < 0:
+            holdings[i] = np.nan
+            continue
+
+        price = prices[i]
+        qty = quantities[i]
+
+        if qty > 0:
+            # Buy: blend into the average cost
+            total_quantity = quantity[g] + qty
+            if total_quantity > 0:
+                avg_cost[g] = (quantity[g] * avg_cost[g] + qty * price) / total_quantity
+            invested[g] += qty * price
+        else:
+            # Sell (negative quantity) at the current average cost
+            sell_quantity = abs(qty)
+            cost_basis = sell_quantity * avg_cost[g]
+            realized[g] += sell_quantity * price - cost_basis
+            invested[g] -= cost_basis
+
+        quantity[g] += qty
+        holdings[i] = quantity[g]
+
+    return quantity, avg_cost, invested, realized, holdings
+
+
+if NUMBA_AVAILABLE:
+    _position_cost_basis_jit = njit(cache=True)(_position_cost_basis_loop)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _return_stats_jit(returns):
+        n = returns.shape[0]
+        total = 0.0
+        downside_total = 0.0
+        downside_count = 0
+        wins = 0
+        best = -np.inf
+        worst = np.inf
+
+        for i in range(n):
+            r = returns[i]
+            total += r
+            if r > 0:
+                wins += 1
+            elif r < 0:
+                downside_total += r
+                downside_count += 1
+            best = max(best, r)
+            worst = min(worst, r)
+
+        mean = total / n
+        downside_mean = downside_total / downside_count if downside_count else 0.0
+
+        # Second pass over deviations, as pandas does, for a stable std
+        squares = 0.0
+        downside_squares = 0.0
+
+        for i in range(n):
+            r = returns[i]
+            squares += (r - mean) ** 2
+            if r < 0:
+                downside_squares += (r - downside_mean) ** 2
+
+        std = np.sqrt(squares / (n - 1)) if n > 1 else np.nan
+        if downside_count == 0:
+            downside_std = 0.0
+        elif downside_count == 1:
+            downside_std = np.nan
+        else:
+            downside_std = np.sqrt(downside_squares / (downside_count - 1))
+
+        return mean, std, downside_std, wins / n * 100, best, worst
+
+
+def group_sum(values, ids, n_groups: int) -> np.ndarray:
+    """
+    Sum values per group
+
+    Args:
+        values: Values to sum
+        ids: Group id per value in [0, n_groups), or -1 for no group
+             (as returned by pd.factorize)
+        n_groups: Number of groups
+
+    Returns:
+        Array of n_groups totals
+    """
+    values = _as_float_array(values)
+    ids = np.ascontiguousarray(ids, dtype=np.int64)
+
+    if NUMBA_AVAILABLE:
+        return _group_sum_jit(values, ids, n_groups)
+
+    keep = (ids >= 0) & ~np.isnan(values)
+    return np.bincount(ids[keep], weights=values[keep], minlength=n_groups).astype(np.float64)
+
+
+def running_peak(values) -> np.ndarray:
+    """
+    Highest value seen so far at each position (NaN until the first value)
+
+    Args:
+        values: Values in time order
+
+    Returns:
+        Array of running maxima
+    """
+    values = _as_float_array(values)
+
+    if NUMBA_AVAILABLE:
+        return _running_peak_jit(values)
+
+    # fmax ignores NaN, so missing values carry the previous peak forward
+    return np.fmax.accumulate(values) if len(values) else values.copy()
+
+
+def position_cost_basis(
+    ids, prices, quantities, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Replay orders into average-cost positions
+
+    Buys (positive quantities) update the average cost; sells realize P&L
+    against it. Orders must be in date order.
+
+    Args:
+        ids: Position id per order in [0, n_groups), or -1 to skip the order
+             (as returned by pd.factorize)
+        prices: Price per order
+        quantities: Signed quantity per order
+        n_groups: Number of positions
+
+    Returns:
+        Tuple of per-position (quantity, average cost, total invested,
+        realized P&L) arrays and the position's quantity after each order
+    """
+    ids = np.ascontiguousarray(ids, dtype=np.int64)
+    prices = _as_float_array(prices)
+    quantities = _as_float_array(quantities)
+
+    if NUMBA_AVAILABLE:
+        return _position_cost_basis_jit(ids, prices, quantities, n_groups)
+
+    # The replay is sequential per position, so without Numba it stays a loop
+    return _position_cost_basis_loop(ids, prices.tolist(), quantities.tolist(), n_groups)
+
+
+def return_stats(returns) -> Tuple[float, float, float, float, float, float]:
+    """
+    Summary statistics of a non-empty returns series in one pass (plus one
+    for deviations)
+
+    Args:
+        returns: Returns without missing values
+
+    Returns:
+        Tuple of (mean, std, downside std, win rate %, best, worst). Standard
+        deviations use ddof=1 and are NaN below two values; the downside std
+        (over negative returns) is 0.0 when there are none.
+    """
+    returns = _as_float_array(returns)
+
+    if NUMBA_AVAILABLE:
+        return _return_stats_jit(returns)
+
+    n = len(returns)
+    downside = returns[returns < 0]
+
+    std = returns.std(ddof=1) if n > 1 else np.nan
+    if len(downside) == 0:
+        downside_std = 0.0
+    elif len(downside) == 1:
+        downside_std = np.nan
+    else:
+        downside_std = downside.std(ddof=1)
+
+    return (
+        returns.mean(), std, downside_std,
+        (returns > 0).sum() / n * 100, returns.max(), returns.min()
+    )
+
+
+def sum_value_pnl_cost(values, pnls, costs) -> Tuple[float, float, float]:
+    """
+    Sum position values, P&L and cost basis in one pass
+
+    Args:
+        values: Market values per position
+        pnls: P&L per position
+        costs: Cost basis per position
+
+    Returns:
+        Tuple of (total value, total P&L, total cost basis)
+    """
+    values = _as_float_array(values)
+    pnls = _as_float_array(pnls)
+    costs = _as_float_array(costs)
+
+    if NUMBA_AVAILABLE:
+        return _sum_value_pnl_cost_jit(values, pnls, costs)
+
+    return float(np.nansum(values)), float(np.nansum(pnls)), float(np.nansum(costs))
@@ -380,11 +380,14 @@ class OptionsPortfolio:
         if values_df.empty:
             return {
                 'num_contracts': 0,
+                'num_positions': 0,
                 'total_market_value': 0.0,
+                'total_cost_basis': 0.0,
                 'total_unrealized_pnl': 0.0,
                 'total_realized_pnl': 0.0,
                 'total_commission': 0.0,
                 'total_pnl': 0.0,
+                'total_return_pct': 0.0,
                 'long_contracts': 0,
                 'short_contracts': 0,
                 'portfolio_delta': 0.0,
@@ -393,13 +396,18 @@ class OptionsPortfolio:
                 'portfolio_vega': 0.0
             }
 
+        # Premiums are tracked through P&L rather than as invested capital,
+        # so options carry no cost basis in the consolidated return
         return {
             'num_contracts': len(values_df),
+            'num_positions': len(values_df),
             'total_market_value': values_df['Market Value'].sum(),
+            'total_cost_basis': 0.0,
             'total_unrealized_pnl': values_df['Unrealized P&L'].sum(),
             'total_realized_pnl': values_df['Realized P&L'].sum(),
             'total_commission': values_df['Commission'].sum(),
             'total_pnl': values_df['Total P&L'].sum(),
+            'total_return_pct': 0.0,
             'long_contracts': len(values_df[values_df['Side'] == 'long']),
             'short_contracts': len(values_df[values_df['Side'] == 'short']),
             'portfolio_delta': values_df['Position Delta'].sum(),
@@ -10,6 +10,7 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import seaborn as sns
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
 from .portfolio_performance import PortfolioPerformanceCalculator
@@ -213,7 +214,8 @@ class PerformanceAnalytics:
         portfolio_performance: pd.DataFrame,
         asset_symbols: List[str],
         asset_names: Dict[str, str] = None,
-        normalize: bool = True
+        normalize: bool = True,
+        asset_data: Dict[str, pd.DataFrame] = None
     ) -> pd.DataFrame:
         """
         Compare portfolio cumulative returns with individual assets
@@ -223,6 +225,8 @@ class PerformanceAnalytics:
             asset_symbols: List of asset symbols to compare
             asset_names: Dictionary mapping symbols to display names
             normalize: If True, normalize all to 100 at start
+            asset_data: Preloaded price history by symbol (optional; symbols
+                        missing from it are read from the historical database)
 
         Returns:
             DataFrame with comparison data
@@ -242,17 +246,20 @@ class PerformanceAnalytics:
         for symbol in asset_symbols:
             try:
                 # Get historical data for asset
-                asset_data = self.performance_calculator.historical_manager.get_historical_data(
-                    symbol, start_date, end_date
-                )
+                if asset_data and symbol in asset_data:
+                    prices = asset_data[symbol]
+                else:
+                    prices = self.performance_calculator.historical_manager.get_historical_data(
+                        symbol, start_date, end_date
+                    )
 
-                if not asset_data.empty:
+                if not prices.empty:
                     asset_name = asset_names.get(symbol, symbol) if asset_names else symbol
-                    asset_data['date'] = pd.to_datetime(asset_data['date'])
 
                     # Merge with comparison
                     comparison = comparison.merge(
-                        asset_data[['date', 'close']].rename(columns={'close': asset_name}),
+                        prices[['date', 'close']].assign(date=pd.to_datetime(prices['date']))
+                        .rename(columns={'close': asset_name}),
                         on='date',
                         how='left'
                     )
@@ -501,7 +508,8 @@ class PerformanceAnalytics:
         portfolio_performance: pd.DataFrame,
         comparison_assets: List[str] = None,
         asset_names: Dict[str, str] = None,
-        benchmark_symbol: str = '^BVSP'
+        benchmark_symbol: str = '^BVSP',
+        asset_data: Dict[str, pd.DataFrame] = None
     ) -> Dict[str, go.Figure]:
         """
         Create comprehensive performance dashboard
@@ -511,30 +519,37 @@ class PerformanceAnalytics:
             comparison_assets: List of asset symbols to compare
             asset_names: Dictionary mapping symbols to names
             benchmark_symbol: Benchmark symbol for alpha calculation
+            asset_data: Preloaded price history by comparison symbol (optional)
 
         Returns:
             Dictionary of Plotly figures
         """
         figures = {}
 
-        # 1. Monthly Returns Heatmap
-        monthly_returns = self.calculate_monthly_returns(portfolio_performance)
-        figures['heatmap'] = self.create_monthly_returns_heatmap_plotly(monthly_returns)
-
-        # 2. Cumulative Returns Comparison
-        if comparison_assets:
-            comparison_df = self.compare_cumulative_returns(
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The benchmark may have to be downloaded: fetch it while the other panels build
+            benchmark_future = executor.submit(
+                self.performance_calculator.compare_to_benchmark,
                 portfolio_performance,
-                comparison_assets,
-                asset_names
+                benchmark_symbol
             )
-            figures['cumulative_comparison'] = self.create_cumulative_return_chart(comparison_df)
 
-        # 3. Alpha Analysis
-        benchmark_comparison = self.performance_calculator.compare_to_benchmark(
-            portfolio_performance,
-            benchmark_symbol
-        )
+            # 1. Monthly Returns Heatmap
+            monthly_returns = self.calculate_monthly_returns(portfolio_performance)
+            figures['heatmap'] = self.create_monthly_returns_heatmap_plotly(monthly_returns)
+
+            # 2. Cumulative Returns Comparison
+            if comparison_assets:
+                comparison_df = self.compare_cumulative_returns(
+                    portfolio_performance,
+                    comparison_assets,
+                    asset_names,
+                    asset_data=asset_data
+                )
+                figures['cumulative_comparison'] = self.create_cumulative_return_chart(comparison_df)
+
+            # 3. Alpha Analysis
+            benchmark_comparison = benchmark_future.result()
 
         if 'benchmark_return' in benchmark_comparison.columns:
             figures['alpha'] = self.create_alpha_visualization(
@@ -3,10 +3,18 @@ Portfolio Aggregator
 Combines stocks, crypto, and bonds into a unified portfolio view
 """
 
+import os
+import copy
+import json
+import time
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from typing import Dict, List
+from functools import partial, lru_cache
+from typing import Callable, Dict, List, Tuple
 from .stock_portfolio import StockPortfolio
 from .crypto_portfolio import CryptoPortfolio
 from .bond_portfolio import BondPortfolio
@@ -17,7 +25,364 @@ from .ibkr_data import IBKRDataFetcherMock
 from .historical_data import HistoricalDataManager
 from .portfolio_performance import PortfolioPerformanceCalculator
 from .fund_accounting import FundAccountingSystem
-from .performance_analytics import PerformanceAnalytics
+from .frame_cache import _source_mtime
+from .numeric_kernels import group_sum
+
+# Arrow tables are an optional, columnar alternative to lists of records
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# orjson is an optional, faster encoder for report files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Asset types in reporting order
+ASSET_TYPES = ('stocks', 'crypto', 'bonds', 'futures', 'options')
+
+# Worker threads for concurrent portfolio valuation (one per asset class)
+MAX_WORKERS = 5
+
+# Summaries and current values are reused for this many seconds
+# (while the loaded orders and their files are unchanged)
+SUMMARY_TTL = 60
+
+# Number of portfolio history date ranges kept in memory
+HISTORY_CACHE_SIZE = 8
+
+# Preset performance periods in days (YTD and MAX are resolved by date)
+PERIOD_DAYS = {'1M': 30, '3M': 90, '6M': 180, '1Y': 365, '3Y': 1095, '5Y': 1825}
+HISTORY_START = '2020-01-01'
+
+# Exchange rates change slowly: fetched rates are kept (in memory and on disk) for an hour
+FX_CACHE_FILE = 'data/cache/fx_rates.json'
+FX_CACHE_TTL = 3600
+FX_PAIRS = ('USD/BRL', 'EUR/BRL')
+
+# Sidecar recording which report a report file holds
+REPORT_MANIFEST_SUFFIX = '.manifest.json'
+
+# Report tables are encoded this many rows at a time
+REPORT_CHUNK_ROWS = 10000
+
+# Summary of an asset class with no orders (common summary schema)
+EMPTY_SUMMARY = {
+    'total_market_value': 0,
+    'total_cost_basis': 0,
+    'total_pnl': 0,
+    'total_return_pct': 0,
+    'num_positions': 0
+}
+
+
+class _SummaryRecord:
+    """Dict-style read access and dict export for summary dataclasses"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> Dict:
+        """Export to plain (JSON-ready) dictionary format"""
+        return asdict(self)
+
+
+@dataclass
+class AssetAllocation(_SummaryRecord):
+    """Value and performance of one asset type within the portfolio"""
+
+    __slots__ = ('value', 'allocation_pct', 'num_positions', 'pnl', 'return_pct')
+
+    value: float
+    allocation_pct: float
+    num_positions: int
+    pnl: float
+    return_pct: float
+
+
+@dataclass
+class DerivativesAllocation(AssetAllocation):
+    """Asset allocation with contract-level detail for futures and options"""
+
+    __slots__ = ('num_contracts', 'unrealized_pnl', 'realized_pnl', 'long_contracts', 'short_contracts')
+
+    num_contracts: int
+    unrealized_pnl: float
+    realized_pnl: float
+    long_contracts: int
+    short_contracts: int
+
+
+@dataclass
+class OptionsAllocation(DerivativesAllocation):
+    """Derivatives allocation with portfolio Greeks"""
+
+    __slots__ = ('portfolio_delta', 'portfolio_theta')
+
+    portfolio_delta: float
+    portfolio_theta: float
+
+
+@dataclass
+class ConsolidatedSummary(_SummaryRecord):
+    """Consolidated portfolio summary across all asset types"""
+
+    __slots__ = ('total_portfolio_value', 'base_currency', 'total_pnl', 'total_return_pct',
+                 'asset_allocation', 'exchange_rates')
+
+    total_portfolio_value: float
+    base_currency: str
+    total_pnl: float
+    total_return_pct: float
+    asset_allocation: Dict[str, AssetAllocation]
+    exchange_rates: Dict[str, float]
+
+
+def _allocation_fields(summary: Dict, allocation_pct: float) -> Dict:
+    """AssetAllocation fields from a portfolio summary (common schema)"""
+    return {
+        'value': summary['total_market_value'],
+        'allocation_pct': allocation_pct,
+        'num_positions': summary['num_positions'],
+        'pnl': summary['total_pnl'],
+        'return_pct': summary['total_return_pct']
+    }
+
+
+def _contract_fields(summary: Dict) -> Dict:
+    """DerivativesAllocation extra fields from a futures/options summary"""
+    return {
+        'num_contracts': summary['num_contracts'],
+        'unrealized_pnl': summary['total_unrealized_pnl'],
+        'realized_pnl': summary['total_realized_pnl'],
+        'long_contracts': summary['long_contracts'],
+        'short_contracts': summary['short_contracts']
+    }
+
+
+def _run_concurrently(tasks: Dict[str, Callable]) -> Dict:
+    """
+    Run independent portfolio calls side by side in a thread pool
+
+    Valuations are I/O-bound (market data requests), so the wall-clock time
+    is roughly that of the slowest call instead of the sum of all of them.
+
+    Args:
+        tasks: Mapping of name to zero-argument callable
+
+    Returns:
+        Mapping of name to result, in the order of tasks
+    """
+    if len(tasks) <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tasks))) as executor:
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def _today() -> str:
+    """Today's date (YYYY-MM-DD), read once per call so a request spans a single day"""
+    return pd.Timestamp.now().strftime('%Y-%m-%d')
+
+
+def _resolve_period(end_date: str = None, period: str = '1Y') -> Tuple[str, str]:
+    """
+    Start and end dates of a preset period
+
+    Args:
+        end_date: End date (YYYY-MM-DD), default is today
+        period: Preset period (1M, 3M, 6M, 1Y, 3Y, 5Y, YTD, MAX); unknown
+                periods fall back to 1Y
+
+    Returns:
+        Tuple of (start date, end date) as YYYY-MM-DD strings
+    """
+    end_date = end_date or _today()
+    return _period_start(end_date, period), end_date
+
+
+@lru_cache(maxsize=64)
+def _period_start(end_date: str, period: str) -> str:
+    """Start date of a preset period ending on end_date (memoized: few distinct pairs occur)"""
+    if period == 'MAX':
+        return HISTORY_START
+
+    end_ts = pd.Timestamp(end_date)
+    if period == 'YTD':
+        return f"{end_ts.year}-01-01"
+
+    return (end_ts - timedelta(days=PERIOD_DAYS.get(period, 365))).strftime('%Y-%m-%d')
+
+
+def _load_saved_rates() -> Tuple[Dict[str, float], float]:
+    """
+    Exchange rates saved less than FX_CACHE_TTL seconds ago
+
+    Returns:
+        Tuple of (rates by pair, time they were saved); ({}, 0.0) if none
+    """
+    try:
+        saved_at = os.path.getmtime(FX_CACHE_FILE)
+        if time.time() - saved_at < FX_CACHE_TTL:
+            with open(FX_CACHE_FILE, 'r') as f:
+                return json.load(f), saved_at
+    except (OSError, ValueError):
+        pass
+    return {}, 0.0
+
+
+def _save_rates(rates: Dict[str, float]):
+    """Persist fetched exchange rates for later runs"""
+    try:
+        os.makedirs(os.path.dirname(FX_CACHE_FILE), exist_ok=True)
+        tmp_path = f"{FX_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(rates, f)
+        os.replace(tmp_path, FX_CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: Could not cache exchange rates: {str(e)}")
+
+
+def _df_to_records(df: pd.DataFrame) -> List[Dict]:
+    """
+    Same records as df.to_dict('records'), built column by column
+
+    Each column is converted to Python scalars in one tolist() call (Timestamps
+    stay Timestamps) and the rows are zipped together, instead of boxing every
+    value separately.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        List of row dictionaries
+    """
+    columns = df.columns.tolist()
+    if not columns:
+        return [{} for _ in range(len(df))]
+
+    values = [df.iloc[:, i].tolist() for i in range(len(columns))]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _export_frame(df: pd.DataFrame, output: str = 'records'):
+    """
+    Convert a DataFrame for returning to callers
+
+    Args:
+        df: DataFrame to convert
+        output: 'records' (list of dicts) or 'arrow' (pyarrow.Table, columnar
+                and without per-row Python objects)
+
+    Returns:
+        List of records or pyarrow.Table
+    """
+    if output == 'records':
+        return _df_to_records(df)
+    if output == 'arrow':
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for output='arrow' (pip install pyarrow)")
+        return pa.Table.from_pandas(df, preserve_index=False)
+    raise ValueError(f"Unknown output format: {output}")
+
+
+def _dumps(value) -> bytes:
+    """Encode a value as UTF-8 JSON, with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _write_json(f, value):
+    """
+    Stream a report value as JSON, section by section
+
+    DataFrames are written as the same records export_complete_report
+    returns (dates as '2024-01-01 00:00:00', floats at full precision);
+    tables longer than REPORT_CHUNK_ROWS are encoded in row chunks so only
+    one chunk of records and JSON text is held in memory at a time.
+
+    Args:
+        f: Binary file opened for writing
+        value: Dictionary, DataFrame or JSON-serializable value
+    """
+    if isinstance(value, pd.DataFrame):
+        if len(value) <= REPORT_CHUNK_ROWS:
+            f.write(_dumps(_df_to_records(value)))
+            return
+
+        # Splice the chunks' record lists into one JSON array
+        f.write(b'[')
+        for start in range(0, len(value), REPORT_CHUNK_ROWS):
+            if start:
+                f.write(b',')
+            f.write(_dumps(_df_to_records(value.iloc[start:start + REPORT_CHUNK_ROWS]))[1:-1])
+        f.write(b']')
+    elif isinstance(value, dict):
+        f.write(b'{')
+        for i, (key, item) in enumerate(value.items()):
+            f.write(b',\n' if i else b'\n')
+            f.write(_dumps(str(key)) + b': ')
+            _write_json(f, item)
+        f.write(b'\n}')
+    else:
+        f.write(_dumps(value))
+
+
+def _write_report(filename: str, report: Dict):
+    """
+    Write a report file unless it already holds this report
+
+    A sidecar manifest (filename + REPORT_MANIFEST_SUFFIX) records which report
+    was written and the file's modification time, so a memoized report is not
+    encoded again while the file is untouched.
+
+    Args:
+        filename: Report file path
+        report: Report with DataFrame tables
+    """
+    manifest_path = filename + REPORT_MANIFEST_SUFFIX
+
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if (manifest.get('generated_at') == report['generated_at']
+                and manifest.get('report_mtime') == os.path.getmtime(filename)):
+            return
+    except (OSError, ValueError):
+        pass
+
+    with open(filename, 'wb') as f:
+        _write_json(f, report)
+
+    try:
+        with open(manifest_path, 'w') as f:
+            json.dump({'generated_at': report['generated_at'], 'report_mtime': os.path.getmtime(filename)}, f)
+    except OSError as e:
+        print(f"Warning: Could not write report manifest: {str(e)}")
+
+
+def _frames_to_records(value):
+    """Copy of a report with every DataFrame converted to a list of records"""
+    if isinstance(value, pd.DataFrame):
+        return _df_to_records(value)
+    if isinstance(value, dict):
+        return {key: _frames_to_records(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_frames_to_records(item) for item in value]
+    return value
 
 
 class PortfolioAggregator:
@@ -25,6 +390,15 @@ class PortfolioAggregator:
     Aggregates all portfolio types (stocks, crypto, bonds) into unified views
     """
 
+    # Fixed attribute set: no per-instance __dict__
+    __slots__ = (
+        'market_data', 'ibkr_data',
+        'stock_portfolio', 'crypto_portfolio', 'bond_portfolio', 'futures_portfolio', 'options_portfolio',
+        'historical_manager', 'performance_calculator', 'fund_accounting', '_performance_analytics',
+        'usd_brl', 'eur_brl', 'brl_usd', 'brl_eur', '_rates_expire_at',
+        '_summary_cache', '_values_cache', '_history_cache'
+    )
+
     def __init__(self):
         """Initialize portfolio aggregator"""
         self.market_data = MarketDataFetcher()
@@ -44,29 +418,238 @@ class PortfolioAggregator:
         self.historical_manager = HistoricalDataManager()
         self.performance_calculator = PortfolioPerformanceCalculator(self.historical_manager)
 
-        # Fund accounting and analytics
+        # Fund accounting (performance analytics are created on first use)
         self.fund_accounting = FundAccountingSystem()
-        self.performance_analytics = PerformanceAnalytics(self.performance_calculator)
+        self._performance_analytics = None
+
+        # Currency conversions (inverse rates are filled alongside)
+        self.usd_brl = None
+        self.eur_brl = None
+        self.brl_usd = None
+        self.brl_eur = None
+        self._rates_expire_at = 0.0
 
-        # Currency conversions
+        # (kind, base_currency) -> (computed at, orders version, summary or report)
+        self._summary_cache = {}
+
+        # asset type -> (computed at, orders version, current values DataFrame)
+        self._values_cache = {}
+
+        # (start, end, loaded orders) -> portfolio history, least recently used first
+        self._history_cache = OrderedDict()
+
+    @property
+    def performance_analytics(self):
+        """Performance analytics, imported on first use (loads plotly, seaborn, matplotlib)"""
+        if self._performance_analytics is None:
+            from .performance_analytics import PerformanceAnalytics
+            self._performance_analytics = PerformanceAnalytics(self.performance_calculator)
+        return self._performance_analytics
+
+    def invalidate_caches(self):
+        """
+        Drop memoized summaries, current values, portfolio histories and exchange rates
+
+        Summaries and current values are also recomputed on their own once the
+        loaded orders or their files change; call this to force fresh prices
+        and rates too.
+        """
+        self._summary_cache.clear()
+        self._values_cache.clear()
+        self._history_cache.clear()
         self.usd_brl = None
         self.eur_brl = None
+        self.brl_usd = None
+        self.brl_eur = None
+
+    def _refresh_sources(self):
+        """Reload orders and bond files edited on disk since they were read"""
+        self.stock_portfolio.reload_if_changed()
+        self.crypto_portfolio.reload_if_changed()
+        self.bond_portfolio.reload_if_changed()
+
+    def _with_orders(self, tasks: Dict[str, Callable]) -> Dict[str, Callable]:
+        """
+        Drop tasks of asset classes that have no orders
+
+        Emptiness is checked on every call against the loaded orders; call
+        _refresh_sources() first so files edited on disk are taken into account.
+        """
+        has_orders = {
+            'stocks': len(self.stock_portfolio.orders) > 0,
+            'crypto': len(self.crypto_portfolio.orders) > 0,
+            'bonds': len(self.bond_portfolio.bonds) > 0
+        }
+        return {name: task for name, task in tasks.items() if has_orders.get(name, True)}
+
+    def _get_history(self, start_date: str, end_date: str = None) -> pd.DataFrame:
+        """
+        Daily portfolio history shared by the performance and analytics views
+
+        Each date range is calculated once per orders version (see
+        _orders_version) and the HISTORY_CACHE_SIZE most recently used ranges
+        are kept. The returned
+        frame is shared, so callers must not modify it in place.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), default is today
+
+        Returns:
+            DataFrame from PortfolioPerformanceCalculator.calculate_portfolio_history
+        """
+        end_date = end_date or _today()
+
+        # Reloaded or edited orders change the version, which retires stale entries
+        key = (start_date, end_date, self._orders_version())
+
+        history_df = self._history_cache.get(key)
+        if history_df is not None:
+            self._history_cache.move_to_end(key)
+            return history_df
+
+        history_df = self.performance_calculator.calculate_portfolio_history(
+            self.stock_portfolio,
+            self.crypto_portfolio,
+            self.bond_portfolio,
+            start_date,
+            end_date
+        )
+
+        self._history_cache[key] = history_df
+        if len(self._history_cache) > HISTORY_CACHE_SIZE:
+            self._history_cache.popitem(last=False)
+
+        return history_df
 
     def _get_exchange_rates(self):
-        """Fetch current exchange rates"""
-        if self.usd_brl is None:
-            self.usd_brl = self.market_data.get_exchange_rate('USD', 'BRL') or 5.0
-        if self.eur_brl is None:
-            self.eur_brl = self.market_data.get_exchange_rate('EUR', 'BRL') or 5.5
+        """Fetch current exchange rates (reusing rates fetched within FX_CACHE_TTL)"""
+        if self.usd_brl is None or self.eur_brl is None or time.time() >= self._rates_expire_at:
+            rates, saved_at = _load_saved_rates()
+
+            # Missing pairs are fetched concurrently
+            missing = [pair for pair in FX_PAIRS if not rates.get(pair)]
+            fetched = _run_concurrently({
+                pair: partial(self.market_data.get_exchange_rate, *pair.split('/'))
+                for pair in missing
+            })
+            rates.update({pair: rate for pair, rate in fetched.items() if rate})
+
+            # Only save complete sets of fetched rates, never the fallbacks
+            if missing and all(rates.get(pair) for pair in FX_PAIRS):
+                _save_rates(rates)
+
+            # Saved rates expire with the file; fetched ones (or fallbacks) a full TTL from now
+            self._rates_expire_at = (time.time() if missing else saved_at) + FX_CACHE_TTL
+
+            self.usd_brl = rates.get('USD/BRL') or 5.0
+            self.brl_usd = 1.0 / self.usd_brl
+            self.eur_brl = rates.get('EUR/BRL') or 5.5
+            self.brl_eur = 1.0 / self.eur_brl
 
         return {
             'USD/BRL': self.usd_brl,
             'EUR/BRL': self.eur_brl,
-            'BRL/USD': 1.0 / self.usd_brl if self.usd_brl else 0.2,
-            'BRL/EUR': 1.0 / self.eur_brl if self.eur_brl else 0.18
+            'BRL/USD': self.brl_usd,
+            'BRL/EUR': self.brl_eur
         }
 
-    def get_consolidated_summary(self, base_currency: str = 'BRL') -> Dict:
+    def _orders_version(self) -> Tuple:
+        """
+        Version of the orders behind the summaries
+
+        Changes when a portfolio's orders are reloaded or added in process, and
+        when an orders file (or bond file) is modified on disk.
+        """
+        return (
+            id(self.stock_portfolio.orders),
+            id(self.crypto_portfolio.orders),
+            id(self.bond_portfolio.bonds),
+            id(self.futures_portfolio.transactions),
+            id(self.options_portfolio.transactions),
+            _source_mtime(self.stock_portfolio.orders_file),
+            _source_mtime(self.crypto_portfolio.orders_file),
+            _source_mtime(self.bond_portfolio.bonds_dir),
+            _source_mtime(self.futures_portfolio.orders_csv),
+            _source_mtime(self.options_portfolio.orders_csv)
+        )
+
+    def _get_cached_summary(self, kind: str, base_currency: str):
+        """Summary (or report) computed less than SUMMARY_TTL seconds ago from the current orders, if any"""
+        cached = self._summary_cache.get((kind, base_currency))
+        if (cached is not None and time.time() - cached[0] < SUMMARY_TTL
+                and cached[1] == self._orders_version()):
+            return cached[2]
+        return None
+
+    def _get_summaries(self, base_currency: str = 'BRL', include_rates: bool = False) -> Dict:
+        """
+        Get individual portfolio summaries, valued concurrently
+
+        All summaries share the total_market_value, total_cost_basis, total_pnl,
+        total_return_pct, num_positions schema; asset classes without orders get
+        EMPTY_SUMMARY. Summaries are reused for SUMMARY_TTL seconds; callers get
+        their own copies, so changing them does not affect the cache. Revaluing
+        drops the consolidated summary built from the previous valuation, so
+        the two never disagree.
+
+        Args:
+            base_currency: Currency for crypto valuation (BRL, USD, EUR)
+            include_rates: Also fetch exchange rates (under 'exchange_rates')
+
+        Returns:
+            Dictionary of summaries by asset type
+        """
+        tasks = {
+            'stocks': self.stock_portfolio.get_portfolio_summary,
+            'crypto': partial(self.crypto_portfolio.get_portfolio_summary, currency=base_currency),
+            'bonds': self.bond_portfolio.get_portfolio_summary,
+            'futures': self.futures_portfolio.get_portfolio_summary,  # Notional value for futures
+            'options': self.options_portfolio.get_portfolio_summary
+        }
+
+        cached = self._get_cached_summary('portfolios', base_currency)
+        if cached is not None:
+            summaries = copy.deepcopy(cached)
+            if include_rates:
+                summaries['exchange_rates'] = self._get_exchange_rates()
+            return summaries
+
+        self._refresh_sources()
+        version = self._orders_version()
+        run = self._with_orders(tasks)
+        if include_rates:
+            run['exchange_rates'] = self._get_exchange_rates
+
+        results = _run_concurrently(run)
+        summaries = {name: results.get(name, EMPTY_SUMMARY) for name in tasks}
+        self._summary_cache[('portfolios', base_currency)] = (time.time(), version, copy.deepcopy(summaries))
+        self._summary_cache.pop(('consolidated', base_currency), None)
+        if include_rates:
+            summaries['exchange_rates'] = results['exchange_rates']
+
+        return summaries
+
+    def get_total_portfolio_value(self, base_currency: str = 'BRL') -> float:
+        """
+        Get total market value across all asset types
+
+        Uses a cached consolidated summary when there is one; otherwise only the
+        portfolio summaries are computed (no allocation breakdown or exchange rates).
+
+        Args:
+            base_currency: Currency for reporting (BRL, USD, EUR)
+
+        Returns:
+            Total portfolio value
+        """
+        cached = self._get_cached_summary('consolidated', base_currency)
+        if cached is not None:
+            return cached.total_portfolio_value
+
+        return sum(s['total_market_value'] for s in self._get_summaries(base_currency).values())
+
+    def get_consolidated_summary(self, base_currency: str = 'BRL') -> ConsolidatedSummary:
         """
         Get consolidated portfolio summary across all asset types
 
@@ -74,207 +657,235 @@ class PortfolioAggregator:
             base_currency: Currency for reporting (BRL, USD, EUR)
 
         Returns:
-            Dictionary with consolidated metrics
-        """
-        # Get individual summaries
-        stock_summary = self.stock_portfolio.get_portfolio_summary()
-        crypto_summary = self.crypto_portfolio.get_portfolio_summary(currency=base_currency)
-        bond_summary = self.bond_portfolio.get_portfolio_summary()
-        futures_summary = self.futures_portfolio.get_portfolio_summary()
-        options_summary = self.options_portfolio.get_portfolio_summary()
-
-        # Exchange rates
-        rates = self._get_exchange_rates()
-
-        # Convert values to base currency
-        stock_value_brl = stock_summary['total_market_value']
-        crypto_value_brl = crypto_summary['total_market_value']
-        bond_value_brl = bond_summary['total_current_value']
-        futures_value_brl = futures_summary['total_notional']  # Notional value for futures
-        options_value_brl = options_summary['total_market_value']
-
-        # Total portfolio
-        total_value = stock_value_brl + crypto_value_brl + bond_value_brl + futures_value_brl + options_value_brl
-
-        # Calculate allocations
-        stock_allocation = (stock_value_brl / total_value * 100) if total_value > 0 else 0
-        crypto_allocation = (crypto_value_brl / total_value * 100) if total_value > 0 else 0
-        bond_allocation = (bond_value_brl / total_value * 100) if total_value > 0 else 0
-        futures_allocation = (futures_value_brl / total_value * 100) if total_value > 0 else 0
-        options_allocation = (options_value_brl / total_value * 100) if total_value > 0 else 0
-
-        # Calculate total P&L
-        total_pnl = (stock_summary['total_pnl'] +
-                     crypto_summary['total_pnl'] +
-                     bond_summary['total_pnl'] +
-                     futures_summary['total_pnl'] +
-                     options_summary['total_pnl'])
-
-        total_cost = (stock_summary['total_cost_basis'] +
-                      crypto_summary['total_cost_basis'] +
-                      bond_summary['total_invested'])
+            ConsolidatedSummary with consolidated metrics (supports summary['key']
+            access; call to_dict() for a plain dictionary). Reused for SUMMARY_TTL
+            seconds while orders are unchanged (see invalidate_caches()); each call
+            returns its own copy, so callers may modify it.
+        """
+        cached = self._get_cached_summary('consolidated', base_currency)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        version = self._orders_version()
+        summaries = self._get_summaries(base_currency, include_rates=True)
+        rates = summaries.pop('exchange_rates')
+
+        # Totals across asset types
+        total_value = sum(s['total_market_value'] for s in summaries.values())
+        total_pnl = sum(s['total_pnl'] for s in summaries.values())
+        total_cost = sum(s['total_cost_basis'] for s in summaries.values())
 
         total_return_pct = (total_pnl / total_cost * 100) if total_cost > 0 else 0
 
+        # Share of total value per asset type (all zero for an empty portfolio)
+        values = np.array([summaries[name]['total_market_value'] for name in ASSET_TYPES], dtype=float)
+        allocation_pct = dict(zip(ASSET_TYPES, (np.divide(
+            values, total_value, out=np.zeros_like(values), where=total_value > 0
+        ) * 100).tolist()))
+
+        futures_summary = summaries['futures']
+        options_summary = summaries['options']
+
+        # Derivatives also report contract-level detail
+        asset_allocation = {
+            'stocks': AssetAllocation(**_allocation_fields(summaries['stocks'], allocation_pct['stocks'])),
+            'crypto': AssetAllocation(**_allocation_fields(summaries['crypto'], allocation_pct['crypto'])),
+            'bonds': AssetAllocation(**_allocation_fields(summaries['bonds'], allocation_pct['bonds'])),
+            'futures': DerivativesAllocation(
+                **_allocation_fields(futures_summary, allocation_pct['futures']),
+                **_contract_fields(futures_summary)
+            ),
+            'options': OptionsAllocation(
+                **_allocation_fields(options_summary, allocation_pct['options']),
+                **_contract_fields(options_summary),
+                portfolio_delta=options_summary['portfolio_delta'],
+                portfolio_theta=options_summary['portfolio_theta']
+            )
+        }
+
+        summary = ConsolidatedSummary(
+            total_portfolio_value=total_value,
+            base_currency=base_currency,
+            total_pnl=total_pnl,
+            total_return_pct=total_return_pct,
+            asset_allocation=asset_allocation,
+            exchange_rates=rates
+        )
+        self._summary_cache[('consolidated', base_currency)] = (time.time(), version, copy.deepcopy(summary))
+
+        return summary
+
+    def _get_current_values(
+        self,
+        asset_types: List[str],
+        current_values: Dict[str, pd.DataFrame] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get current values (positions) of several asset types, valued concurrently
+
+        Values are reused for SUMMARY_TTL seconds while orders are unchanged, so
+        the returned frames are shared and must not be modified in place.
+
+        Args:
+            asset_types: Asset types to value
+            current_values: Already computed values by asset type, reused as is
+
+        Returns:
+            Dictionary of DataFrames by asset type (empty for types without orders)
+        """
+        loaders = {
+            'stocks': self.stock_portfolio.get_current_values,
+            'crypto': self.crypto_portfolio.get_current_values,
+            'bonds': self.bond_portfolio.get_current_values,
+            'futures': self.futures_portfolio.get_current_values,
+            'options': self.options_portfolio.get_current_values
+        }
+        current_values = dict(current_values or {})
+
+        self._refresh_sources()
+        version = self._orders_version()
+        computed_at = time.time()
+        for name in asset_types:
+            cached = self._values_cache.get(name)
+            if (name not in current_values and cached is not None
+                    and computed_at - cached[0] < SUMMARY_TTL and cached[1] == version):
+                current_values[name] = cached[2]
+
+        loaded = _run_concurrently(self._with_orders({
+            name: loaders[name] for name in asset_types if name not in current_values
+        }))
+        for name, values in loaded.items():
+            self._values_cache[name] = (computed_at, version, values)
+
         return {
-            'total_portfolio_value': total_value,
-            'base_currency': base_currency,
-            'total_pnl': total_pnl,
-            'total_return_pct': total_return_pct,
-            'asset_allocation': {
-                'stocks': {
-                    'value': stock_value_brl,
-                    'allocation_pct': stock_allocation,
-                    'num_positions': stock_summary['num_positions'],
-                    'pnl': stock_summary['total_pnl'],
-                    'return_pct': stock_summary['total_return_pct']
-                },
-                'crypto': {
-                    'value': crypto_value_brl,
-                    'allocation_pct': crypto_allocation,
-                    'num_positions': crypto_summary['num_positions'],
-                    'pnl': crypto_summary['total_pnl'],
-                    'return_pct': crypto_summary['total_return_pct']
-                },
-                'bonds': {
-                    'value': bond_value_brl,
-                    'allocation_pct': bond_allocation,
-                    'num_positions': bond_summary['num_bonds'],
-                    'pnl': bond_summary['total_pnl'],
-                    'return_pct': bond_summary['total_return_pct']
-                },
-                'futures': {
-                    'value': futures_value_brl,
-                    'allocation_pct': futures_allocation,
-                    'num_contracts': futures_summary['num_contracts'],
-                    'pnl': futures_summary['total_pnl'],
-                    'unrealized_pnl': futures_summary['total_unrealized_pnl'],
-                    'realized_pnl': futures_summary['total_realized_pnl'],
-                    'long_contracts': futures_summary['long_contracts'],
-                    'short_contracts': futures_summary['short_contracts']
-                },
-                'options': {
-                    'value': options_value_brl,
-                    'allocation_pct': options_allocation,
-                    'num_contracts': options_summary['num_contracts'],
-                    'pnl': options_summary['total_pnl'],
-                    'unrealized_pnl': options_summary['total_unrealized_pnl'],
-                    'realized_pnl': options_summary['total_realized_pnl'],
-                    'portfolio_delta': options_summary['portfolio_delta'],
-                    'portfolio_theta': options_summary['portfolio_theta'],
-                    'long_contracts': options_summary['long_contracts'],
-                    'short_contracts': options_summary['short_contracts']
-                }
-            },
-            'exchange_rates': rates
+            name: current_values[name] if name in current_values else loaded.get(name, pd.DataFrame())
+            for name in asset_types
         }
 
-    def get_all_positions(self) -> Dict:
+    def get_all_positions(
+        self,
+        asset_types: List[str] = None,
+        output: str = 'records',
+        current_values: Dict[str, pd.DataFrame] = None
+    ) -> Dict:
         """
         Get all positions across all asset types
 
+        Args:
+            asset_types: Asset types to include (stocks, crypto, bonds, futures,
+                         options). Default: all. Only the requested types are valued.
+            output: 'records' (lists of dicts) or 'arrow' (pyarrow Tables)
+            current_values: Already computed current values by asset type (optional)
+
         Returns:
             Dictionary with positions by asset type
         """
-        return {
-            'stocks': self.stock_portfolio.get_current_values().to_dict('records'),
-            'crypto': self.crypto_portfolio.get_current_values().to_dict('records'),
-            'bonds': self.bond_portfolio.get_current_values().to_dict('records'),
-            'futures': self.futures_portfolio.get_current_values().to_dict('records'),
-            'options': self.options_portfolio.get_current_values().to_dict('records')
-        }
+        if asset_types is None:
+            asset_types = list(ASSET_TYPES)
 
-    def get_top_performers(self, n: int = 10) -> pd.DataFrame:
+        unknown = [name for name in asset_types if name not in ASSET_TYPES]
+        if unknown:
+            raise ValueError(f"Unknown asset types: {', '.join(unknown)}")
+
+        positions = self._get_current_values(asset_types, current_values)
+
+        return {name: _export_frame(positions[name], output) for name in asset_types}
+
+    def get_top_performers(self, n: int = 10, current_values: Dict[str, pd.DataFrame] = None) -> pd.DataFrame:
         """
         Get top performing positions across all assets
 
         Args:
             n: Number of top performers to return
+            current_values: Already computed current values by asset type (optional)
 
         Returns:
             DataFrame with top performers
         """
-        performers = []
+        # (type, market, asset column, value column, P&L % column)
+        # A market of None means the positions carry their own 'Market' column
+        specs = {
+            'stocks': ('Stock', None, 'Symbol', 'Market Value', 'Total P&L %'),
+            'crypto': ('Crypto', 'Global', 'Symbol', 'Market Value', 'Total P&L %'),
+            'bonds': ('Bond', 'Brasil', 'Título', 'Valor Atual', 'P&L %')
+        }
 
-        # Stocks
-        stock_positions = self.stock_portfolio.get_current_values()
-        if not stock_positions.empty:
-            for _, pos in stock_positions.iterrows():
-                performers.append({
-                    'Asset': pos['Symbol'],
-                    'Type': 'Stock',
-                    'Market': pos['Market'],
-                    'Value': pos['Market Value'],
-                    'P&L %': pos['Total P&L %']
-                })
+        loaded = self._get_current_values(list(specs), current_values)
 
-        # Crypto
-        crypto_positions = self.crypto_portfolio.get_current_values()
-        if not crypto_positions.empty:
-            for _, pos in crypto_positions.iterrows():
-                performers.append({
-                    'Asset': pos['Symbol'],
-                    'Type': 'Crypto',
-                    'Market': 'Global',
-                    'Value': pos['Market Value'],
-                    'P&L %': pos['Total P&L %']
-                })
-
-        # Bonds
-        bond_positions = self.bond_portfolio.get_current_values()
-        if not bond_positions.empty:
-            for _, pos in bond_positions.iterrows():
-                performers.append({
-                    'Asset': pos['Título'][:30],  # Truncate long bond names
-                    'Type': 'Bond',
-                    'Market': 'Brasil',
-                    'Value': pos['Valor Atual'],
-                    'P&L %': pos['P&L %']
-                })
-
-        df = pd.DataFrame(performers)
-
-        if df.empty:
-            return df
-
-        # Sort by P&L % descending
-        df = df.sort_values('P&L %', ascending=False)
-
-        return df.head(n)
-
-    def get_allocation_chart_data(self) -> Dict:
+        frames = []
+        for name, positions in loaded.items():
+            if len(positions) == 0:
+                continue
+
+            asset_type, market, asset_col, value_col, pnl_col = specs[name]
+
+            assets = positions[asset_col]
+            if name == 'bonds':
+                assets = assets.astype(str).str.slice(0, 30)  # Truncate long bond names
+
+            frames.append(pd.DataFrame({
+                'Asset': assets,
+                'Type': asset_type,
+                'Market': positions['Market'] if market is None else market,
+                'Value': positions[value_col],
+                'P&L %': positions[pnl_col]
+            }))
+
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+
+        # Small label domains: store as integer codes (types in asset-class order)
+        df['Type'] = pd.Categorical(df['Type'], categories=[spec[0] for spec in specs.values()])
+        df['Market'] = df['Market'].astype('category')
+
+        # Top n by P&L % (partial selection instead of a full sort)
+        return df.nlargest(n, 'P&L %')
+
+    def get_allocation_chart_data(self, current_values: Dict[str, pd.DataFrame] = None) -> Dict:
         """
         Get data formatted for allocation charts
 
+        Args:
+            current_values: Already computed current values by asset type (optional)
+
         Returns:
             Dictionary with chart-ready data
         """
-        summary = self.get_consolidated_summary()
+        allocation = self.get_consolidated_summary().asset_allocation
 
         # Asset type allocation
         asset_allocation = [
-            {'name': 'Stocks', 'value': summary['asset_allocation']['stocks']['value']},
-            {'name': 'Crypto', 'value': summary['asset_allocation']['crypto']['value']},
-            {'name': 'Bonds', 'value': summary['asset_allocation']['bonds']['value']}
+            {'name': 'Stocks', 'value': allocation['stocks'].value},
+            {'name': 'Crypto', 'value': allocation['crypto'].value},
+            {'name': 'Bonds', 'value': allocation['bonds'].value}
         ]
 
+        current_values = self._get_current_values(['stocks', 'bonds'], current_values)
+
         # Market allocation (for stocks)
-        stock_df = self.stock_portfolio.get_current_values()
         market_allocation = []
+        stock_df = current_values['stocks']
         if not stock_df.empty:
-            by_market = stock_df.groupby('Market')['Market Value'].sum()
-            for market, value in by_market.items():
-                market_allocation.append({'name': market, 'value': value})
-
-        # Bond type allocation
+            market_ids, markets = pd.factorize(stock_df['Market'])
+            totals = group_sum(stock_df['Market Value'], market_ids, len(markets))
+            market_allocation = [
+                {'name': market, 'value': value}
+                for market, value in zip(markets.tolist(), totals.tolist())
+            ]
+
+        # Bond type allocation, largest first (as BondPortfolio.get_allocation_by_type)
         bond_type_allocation = []
-        bond_by_type = self.bond_portfolio.get_allocation_by_type()
-        if not bond_by_type.empty:
-            for _, row in bond_by_type.iterrows():
-                bond_type_allocation.append({
-                    'name': row['Tipo'],
-                    'value': row['Valor Atual']
-                })
+        bond_df = current_values['bonds']
+        if not bond_df.empty:
+            type_ids, bond_types = pd.factorize(bond_df['Tipo'], sort=True)
+            totals = group_sum(bond_df['Valor Atual'], type_ids, len(bond_types))
+            order = np.argsort(-totals, kind='stable')
+            bond_type_allocation = [
+                {'name': name, 'value': value}
+                for name, value in zip(bond_types[order].tolist(), totals[order].tolist())
+            ]
 
         return {
             'asset_allocation': asset_allocation,
@@ -286,52 +897,78 @@ class PortfolioAggregator:
         """
         Export complete portfolio report
 
+        The report is reused for SUMMARY_TTL seconds while orders are unchanged,
+        and an existing file already holding it is not written again. Its
+        per-portfolio summaries come from the shared summary cache, so they
+        match the consolidated summary.
+
         Args:
             filename: Optional filename to save JSON report
 
         Returns:
             Complete portfolio data dictionary
         """
+        report = self._get_cached_summary('report', 'BRL')
+        if report is None:
+            report = self._build_report()
+
+        if filename:
+            _write_report(filename, report)
+
+        return _frames_to_records(report)
+
+    def _build_report(self) -> Dict:
+        """Complete portfolio report with tables as DataFrames (memoized in _summary_cache)"""
+        version = self._orders_version()
+
+        # Value every asset type once and share the frames and summaries between sections
+        current_values = self._get_current_values(list(ASSET_TYPES))
+        summaries = self._get_summaries('BRL')
+        summary = self.get_consolidated_summary('BRL')
+
+        # Tables stay DataFrames until they are written or returned
         report = {
             'generated_at': datetime.now().isoformat(),
-            'summary': self.get_consolidated_summary(),
-            'positions': self.get_all_positions(),
+            'summary': summary.to_dict(),
+            'positions': {name: current_values[name] for name in ASSET_TYPES},
             'stocks': {
-                'summary': self.stock_portfolio.get_portfolio_summary(),
-                'positions': self.stock_portfolio.get_current_values().to_dict('records'),
-                'transactions': self.stock_portfolio.get_transactions_history().to_dict('records')
+                'summary': summaries['stocks'],
+                'positions': current_values['stocks'],
+                'transactions': self.stock_portfolio.get_transactions_history()
             },
             'crypto': {
-                'summary': self.crypto_portfolio.get_portfolio_summary(),
-                'positions': self.crypto_portfolio.get_current_values().to_dict('records'),
-                'allocation': self.crypto_portfolio.get_allocation().to_dict('records'),
-                'transactions': self.crypto_portfolio.get_transactions_history().to_dict('records')
+                'summary': summaries['crypto'],
+                'positions': current_values['crypto'],
+                'allocation': self.crypto_portfolio.get_allocation(),
+                'transactions': self.crypto_portfolio.get_transactions_history()
             },
             'bonds': {
-                'summary': self.bond_portfolio.get_portfolio_summary(),
-                'positions': self.bond_portfolio.get_current_values().to_dict('records'),
-                'allocation_by_type': self.bond_portfolio.get_allocation_by_type().to_dict('records'),
-                'allocation_by_indexer': self.bond_portfolio.get_allocation_by_indexer().to_dict('records'),
-                'maturity_schedule': self.bond_portfolio.get_maturity_schedule().to_dict('records')
+                'summary': summaries['bonds'],
+                'positions': current_values['bonds'],
+                'allocation_by_type': self.bond_portfolio.get_allocation_by_type(),
+                'allocation_by_indexer': self.bond_portfolio.get_allocation_by_indexer(),
+                'maturity_schedule': self.bond_portfolio.get_maturity_schedule()
             },
-            'top_performers': self.get_top_performers(20).to_dict('records'),
-            'chart_data': self.get_allocation_chart_data()
+            'top_performers': self.get_top_performers(20, current_values),
+            'chart_data': self.get_allocation_chart_data(current_values)
         }
-
-        if filename:
-            import json
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        self._summary_cache[('report', 'BRL')] = (time.time(), version, report)
 
         return report
 
-    def initialize_historical_data(self, start_date: str = '2020-01-01', batch_days: int = 90):
+    def initialize_historical_data(
+        self,
+        start_date: str = HISTORY_START,
+        batch_days: int = 90,
+        max_workers: int = 8
+    ):
         """
         Initialize historical data for all portfolio assets
 
         Args:
             start_date: Start date for historical data
             batch_days: Days per batch for fetching
+            max_workers: Maximum number of symbols fetched at the same time
 
         Returns:
             Dictionary with fetch statistics
@@ -340,34 +977,33 @@ class PortfolioAggregator:
         print("Initializing Historical Data for Portfolio")
         print(f"{'='*60}\n")
 
-        # Get all unique symbols from portfolios
-        symbols = []
-
         # Stocks
-        if not self.stock_portfolio.positions:
+        if not self.stock_portfolio.positions_fresh():
             self.stock_portfolio.calculate_positions()
 
-        for symbol, pos in self.stock_portfolio.positions.items():
-            if pos['quantity'] != 0:
-                yahoo_symbol = self.stock_portfolio._get_yahoo_symbol(symbol, pos['market'])
-                symbols.append(yahoo_symbol)
+        stock_symbols = [
+            self.stock_portfolio._get_yahoo_symbol(symbol, pos['market'])
+            for symbol, pos in self.stock_portfolio.positions.items()
+            if pos['quantity'] != 0
+        ]
 
         # Crypto
-        if not self.crypto_portfolio.positions:
+        if not self.crypto_portfolio.positions_fresh():
             self.crypto_portfolio.calculate_positions()
 
-        for symbol in self.crypto_portfolio.positions.keys():
-            crypto_symbol = f"{symbol}-USD" if not symbol.endswith('-USD') else symbol
-            symbols.append(crypto_symbol)
+        crypto_symbols = [
+            self.crypto_portfolio._get_yahoo_symbol(symbol)
+            for symbol in self.crypto_portfolio.positions
+        ]
 
-        # Remove duplicates
-        symbols = list(set(symbols))
+        # Unique, non-empty symbols, in portfolio order
+        symbols = [symbol for symbol in dict.fromkeys(stock_symbols + crypto_symbols) if symbol]
 
         print(f"Found {len(symbols)} unique symbols to fetch")
         print(f"Symbols: {', '.join(symbols[:10])}{'...' if len(symbols) > 10 else ''}\n")
 
         # Bulk fetch
-        self.historical_manager.bulk_fetch(symbols, start_date, batch_days=batch_days)
+        self.historical_manager.bulk_fetch(symbols, start_date, batch_days=batch_days, max_workers=max_workers)
 
         # Get stats
         stats = self.historical_manager.get_database_stats()
@@ -385,7 +1021,8 @@ class PortfolioAggregator:
         self,
         start_date: str = None,
         end_date: str = None,
-        period: str = '1Y'
+        period: str = '1Y',
+        output: str = 'records'
     ) -> Dict:
         """
         Get historical portfolio performance
@@ -394,46 +1031,23 @@ class PortfolioAggregator:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             period: Preset period (1M, 3M, 6M, 1Y, 3Y, 5Y, YTD, MAX)
+            output: 'records' (lists of dicts) or 'arrow' (pyarrow Tables)
 
         Returns:
             Dictionary with performance data and metrics
         """
         # Handle preset periods
         if not start_date:
-            end_date = end_date or datetime.now().strftime('%Y-%m-%d')
-            end_ts = pd.Timestamp(end_date)
-
-            if period == '1M':
-                start_date = (end_ts - timedelta(days=30)).strftime('%Y-%m-%d')
-            elif period == '3M':
-                start_date = (end_ts - timedelta(days=90)).strftime('%Y-%m-%d')
-            elif period == '6M':
-                start_date = (end_ts - timedelta(days=180)).strftime('%Y-%m-%d')
-            elif period == '1Y':
-                start_date = (end_ts - timedelta(days=365)).strftime('%Y-%m-%d')
-            elif period == '3Y':
-                start_date = (end_ts - timedelta(days=1095)).strftime('%Y-%m-%d')
-            elif period == '5Y':
-                start_date = (end_ts - timedelta(days=1825)).strftime('%Y-%m-%d')
-            elif period == 'YTD':
-                start_date = f"{end_ts.year}-01-01"
-            elif period == 'MAX':
-                start_date = '2020-01-01'
-            else:
-                start_date = (end_ts - timedelta(days=365)).strftime('%Y-%m-%d')
+            start_date, end_date = _resolve_period(end_date, period)
+        else:
+            end_date = end_date or _today()
 
         # Calculate portfolio history
-        history_df = self.performance_calculator.calculate_portfolio_history(
-            self.stock_portfolio,
-            self.crypto_portfolio,
-            self.bond_portfolio,
-            start_date,
-            end_date
-        )
+        history_df = self._get_history(start_date, end_date)
 
         if history_df.empty:
             return {
-                'performance': [],
+                'performance': _export_frame(history_df, output),
                 'metrics': {},
                 'period': period,
                 'start_date': start_date,
@@ -450,20 +1064,21 @@ class PortfolioAggregator:
         rolling_metrics = self.performance_calculator.get_rolling_metrics(history_df, window_days=30)
 
         return {
-            'performance': history_df.to_dict('records'),
+            'performance': _export_frame(history_df, output),
             'metrics': metrics,
-            'drawdown': drawdown_df.to_dict('records'),
-            'rolling_metrics': rolling_metrics.to_dict('records'),
+            'drawdown': _export_frame(drawdown_df, output),
+            'rolling_metrics': _export_frame(rolling_metrics, output),
             'period': period,
             'start_date': start_date,
-            'end_date': end_date or datetime.now().strftime('%Y-%m-%d')
+            'end_date': end_date
         }
 
     def get_performance_comparison(
         self,
         start_date: str = None,
         end_date: str = None,
-        benchmark: str = '^BVSP'  # Bovespa Index for Brazilian portfolio
+        benchmark: str = '^BVSP',  # Bovespa Index for Brazilian portfolio
+        output: str = 'records'
     ) -> Dict:
         """
         Compare portfolio performance to benchmark
@@ -472,22 +1087,16 @@ class PortfolioAggregator:
             start_date: Start date
             end_date: End date
             benchmark: Benchmark symbol (default: Bovespa)
+            output: 'records' (list of dicts) or 'arrow' (pyarrow Table)
 
         Returns:
             Dictionary with comparison data
         """
         if not start_date:
-            end_date = end_date or datetime.now().strftime('%Y-%m-%d')
-            start_date = (pd.Timestamp(end_date) - timedelta(days=365)).strftime('%Y-%m-%d')
+            start_date, end_date = _resolve_period(end_date, '1Y')
 
         # Get portfolio history
-        history_df = self.performance_calculator.calculate_portfolio_history(
-            self.stock_portfolio,
-            self.crypto_portfolio,
-            self.bond_portfolio,
-            start_date,
-            end_date
-        )
+        history_df = self._get_history(start_date, end_date)
 
         if history_df.empty:
             return {}
@@ -499,7 +1108,7 @@ class PortfolioAggregator:
         )
 
         return {
-            'comparison': comparison_df.to_dict('records'),
+            'comparison': _export_frame(comparison_df, output),
             'benchmark_symbol': benchmark,
             'start_date': start_date,
             'end_date': end_date
@@ -517,13 +1126,12 @@ class PortfolioAggregator:
         Returns:
             Dictionary with NAV breakdown
         """
-        summary = self.get_consolidated_summary()
-        portfolio_value = summary['total_portfolio_value']
+        portfolio_value = self.get_total_portfolio_value()
         cash_position = self.fund_accounting.cash_manager.get_cash_position(as_of_date)
         nav = self.fund_accounting.calculate_nav(portfolio_value, cash_position)
 
         return {
-            'date': as_of_date or datetime.now().strftime('%Y-%m-%d'),
+            'date': as_of_date or _today(),
             'portfolio_value': portfolio_value,
             'cash_position': cash_position,
             'outstanding_fees': self.fund_accounting.fee_calculator.get_outstanding_fees()['fee_amount'].sum(),
@@ -546,23 +1154,26 @@ class PortfolioAggregator:
         investor_stakes = self.fund_accounting.investor_tracker.get_investor_stakes(as_of_date)
 
         investors = []
-        for _, investor in investor_stakes.iterrows():
-            investor_nav = total_nav * (investor['stake_pct'] / 100)
-            investors.append({
-                'investor_id': investor['investor_id'],
-                'investor_name': investor['investor_name'],
-                'deposits': investor['deposits'],
-                'withdrawals': investor['withdrawals'],
-                'net_contribution': investor['net_contribution'],
-                'stake_pct': investor['stake_pct'],
-                'nav': investor_nav,
-                'unrealized_gain': investor_nav - investor['net_contribution'],
-                'return_pct': ((investor_nav - investor['net_contribution']) / investor['net_contribution'] * 100)
-                    if investor['net_contribution'] > 0 else 0
-            })
+        if not investor_stakes.empty:
+            # Column-wise: each investor's share of NAV and gain on net contribution
+            net_contribution = investor_stakes['net_contribution'].to_numpy(dtype=float)
+            investor_nav = total_nav * (investor_stakes['stake_pct'].to_numpy(dtype=float) / 100)
+            unrealized_gain = investor_nav - net_contribution
+            return_pct = np.divide(
+                unrealized_gain, net_contribution,
+                out=np.zeros_like(unrealized_gain), where=net_contribution > 0
+            ) * 100
+
+            investors = _df_to_records(investor_stakes[[
+                'investor_id', 'investor_name', 'deposits', 'withdrawals', 'net_contribution', 'stake_pct'
+            ]].assign(
+                nav=investor_nav,
+                unrealized_gain=unrealized_gain,
+                return_pct=return_pct
+            ))
 
         return {
-            'as_of_date': as_of_date or datetime.now().strftime('%Y-%m-%d'),
+            'as_of_date': nav_info['date'],
             'total_nav': total_nav,
             'num_investors': len(investors),
             'investors': investors
@@ -634,17 +1245,10 @@ class PortfolioAggregator:
             Plotly or Matplotlib figure
         """
         if not start_date:
-            end_date = end_date or datetime.now().strftime('%Y-%m-%d')
-            start_date = (pd.Timestamp(end_date) - timedelta(days=1095)).strftime('%Y-%m-%d')  # 3 years
+            start_date, end_date = _resolve_period(end_date, '3Y')
 
         # Get portfolio history
-        history_df = self.performance_calculator.calculate_portfolio_history(
-            self.stock_portfolio,
-            self.crypto_portfolio,
-            self.bond_portfolio,
-            start_date,
-            end_date
-        )
+        history_df = self._get_history(start_date, end_date)
 
         if history_df.empty:
             return None
@@ -677,17 +1281,10 @@ class PortfolioAggregator:
             Dictionary with comparison data and chart
         """
         if not start_date:
-            end_date = end_date or datetime.now().strftime('%Y-%m-%d')
-            start_date = (pd.Timestamp(end_date) - timedelta(days=365)).strftime('%Y-%m-%d')
+            start_date, end_date = _resolve_period(end_date, '1Y')
 
         # Get portfolio history
-        history_df = self.performance_calculator.calculate_portfolio_history(
-            self.stock_portfolio,
-            self.crypto_portfolio,
-            self.bond_portfolio,
-            start_date,
-            end_date
-        )
+        history_df = self._get_history(start_date, end_date)
 
         if history_df.empty:
             return {'comparison': [], 'chart': None}
@@ -703,7 +1300,7 @@ class PortfolioAggregator:
         chart = self.performance_analytics.create_cumulative_return_chart(comparison_df)
 
         return {
-            'comparison': comparison_df.to_dict('records'),
+            'comparison': _df_to_records(comparison_df),
             'chart': chart
         }
 
@@ -725,17 +1322,10 @@ class PortfolioAggregator:
             Dictionary with alpha metrics and visualization
         """
         if not start_date:
-            end_date = end_date or datetime.now().strftime('%Y-%m-%d')
-            start_date = (pd.Timestamp(end_date) - timedelta(days=365)).strftime('%Y-%m-%d')
+            start_date, end_date = _resolve_period(end_date, '1Y')
 
         # Get portfolio history
-        history_df = self.performance_calculator.calculate_portfolio_history(
-            self.stock_portfolio,
-            self.crypto_portfolio,
-            self.bond_portfolio,
-            start_date,
-            end_date
-        )
+        history_df = self._get_history(start_date, end_date)
 
         if history_df.empty:
             return {'metrics': {}, 'chart': None}
@@ -763,8 +1353,8 @@ class PortfolioAggregator:
 
         return {
             'metrics': alpha_metrics,
-            'comparison': comparison_df[['date', 'cumulative_return', 'benchmark_cumulative',
-                                        'cumulative_alpha']].to_dict('records') if 'cumulative_alpha' in comparison_df.columns else [],
+            'comparison': _df_to_records(comparison_df[['date', 'cumulative_return', 'benchmark_cumulative',
+                                                       'cumulative_alpha']]) if 'cumulative_alpha' in comparison_df.columns else [],
             'chart': chart,
             'benchmark_symbol': benchmark_symbol,
             'start_date': start_date,
@@ -788,26 +1378,30 @@ class PortfolioAggregator:
         Returns:
             Dictionary with all analytics figures
         """
-        # Get 1-year history
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (pd.Timestamp(end_date) - timedelta(days=365)).strftime('%Y-%m-%d')
+        # Get 1-year history, ending on the same day for every panel
+        start_date, end_date = _resolve_period(_today(), '1Y')
 
-        history_df = self.performance_calculator.calculate_portfolio_history(
-            self.stock_portfolio,
-            self.crypto_portfolio,
-            self.bond_portfolio,
-            start_date,
-            end_date
-        )
+        history_df = self._get_history(start_date, end_date)
 
         if history_df.empty:
             return {}
 
+        # Load comparison asset prices concurrently, up front
+        asset_data = None
+        if comparison_assets:
+            first_date = history_df['date'].min().strftime('%Y-%m-%d')
+            last_date = history_df['date'].max().strftime('%Y-%m-%d')
+            asset_data = _run_concurrently({
+                symbol: partial(self.historical_manager.get_historical_data, symbol, first_date, last_date)
+                for symbol in dict.fromkeys(comparison_assets)
+            })
+
         figures = self.performance_analytics.create_performance_dashboard(
             history_df,
             comparison_assets,
             asset_names,
-            benchmark_symbol
+            benchmark_symbol,
+            asset_data=asset_data
         )
 
         return figures
@@ -824,19 +1418,19 @@ def test_portfolio_aggregator():
     print("\n1. Consolidated Portfolio Summary:")
     print("-" * 80)
     summary = aggregator.get_consolidated_summary()
-    print(f"Total Portfolio Value: R$ {summary['total_portfolio_value']:,.2f}")
-    print(f"Total P&L: R$ {summary['total_pnl']:,.2f}")
-    print(f"Total Return: {summary['total_return_pct']:.2f}%")
+    print(f"Total Portfolio Value: R$ {summary.total_portfolio_value:,.2f}")
+    print(f"Total P&L: R$ {summary.total_pnl:,.2f}")
+    print(f"Total Return: {summary.total_return_pct:.2f}%")
 
     print("\n2. Asset Allocation:")
     print("-" * 80)
-    for asset_type, data in summary['asset_allocation'].items():
+    for asset_type, data in summary.asset_allocation.items():
         print(f"\n{asset_type.upper()}:")
-        print(f"  Value: R$ {data['value']:,.2f}")
-        print(f"  Allocation: {data['allocation_pct']:.2f}%")
-        print(f"  Positions: {data['num_positions']}")
-        print(f"  P&L: R$ {data['pnl']:,.2f}")
-        print(f"  Return: {data['return_pct']:.2f}%")
+        print(f"  Value: R$ {data.value:,.2f}")
+        print(f"  Allocation: {data.allocation_pct:.2f}%")
+        print(f"  Positions: {data.num_positions}")
+        print(f"  P&L: R$ {data.pnl:,.2f}")
+        print(f"  Return: {data.return_pct:.2f}%")
 
     print("\n3. Top 10 Performers:")
     print("-" * 80)
@@ -6,11 +6,20 @@ Calculates historical portfolio values and performance metrics
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
 from .historical_data import HistoricalDataManager
 from .stock_portfolio import StockPortfolio
 from .crypto_portfolio import CryptoPortfolio
 from .bond_portfolio import BondPortfolio
+from .numeric_kernels import return_stats, running_peak
+
+# Days a price series may be missing at either end before it is (re)fetched
+# (covers weekends and holidays)
+MAX_PRICE_GAP_DAYS = 5
+
+# Concurrent Yahoo downloads when several symbols need history
+PRICE_FETCH_WORKERS = 8
 
 
 class PortfolioPerformanceCalculator:
@@ -33,6 +42,9 @@ class PortfolioPerformanceCalculator:
         """
         Calculate daily portfolio values over time
 
+        Values are taken on business days (Monday to Friday), matching the 252
+        trading days per year the risk metrics annualize with.
+
         Args:
             stock_portfolio: StockPortfolio instance
             crypto_portfolio: CryptoPortfolio instance
@@ -43,169 +55,223 @@ class PortfolioPerformanceCalculator:
         Returns:
             DataFrame with columns: date, stock_value, crypto_value, bond_value,
                                    total_value, daily_return, cumulative_return
+            (empty if the range has no business days or nothing is held)
         """
         if end_date is None:
             end_date = datetime.now().strftime('%Y-%m-%d')
 
-        # Generate date range
-        dates = pd.date_range(start=start_date, end=end_date, freq='D')
+        # Generate business-day range (prices do not move on weekends)
+        dates = pd.bdate_range(start=start_date, end=end_date)
 
-        results = []
+        if dates.empty:
+            return pd.DataFrame()
 
-        for date in dates:
-            date_str = date.strftime('%Y-%m-%d')
+        # Stocks and crypto: holdings times prices for every date at once
+        stock_holdings = self._get_position_holdings(
+            stock_portfolio,
+            lambda symbol, pos: stock_portfolio._get_yahoo_symbol(symbol, pos['market']),
+            dates
+        )
 
-            # Calculate portfolio values for this date
-            stock_value = self._calculate_stock_value_at_date(
-                stock_portfolio, date_str
-            )
+        crypto_holdings = self._get_position_holdings(
+            crypto_portfolio,
+            lambda symbol, pos: crypto_portfolio._get_yahoo_symbol(symbol),
+            dates
+        )
 
-            crypto_value = self._calculate_crypto_value_at_date(
-                crypto_portfolio, date_str
-            )
+        # Nothing held in any portfolio: skip prices and bond valuation
+        if not stock_holdings and not crypto_holdings and bond_portfolio.bonds.empty:
+            return pd.DataFrame()
 
-            bond_value = self._calculate_bond_value_at_date(
-                bond_portfolio, date
-            )
+        # One price series per symbol, loaded up front
+        prices = self._prefetch_prices(stock_holdings + crypto_holdings, dates)
 
-            total_value = stock_value + crypto_value + bond_value
+        stock_values = self._sum_position_values(stock_holdings, prices, len(dates))
+        crypto_values = self._sum_position_values(crypto_holdings, prices, len(dates))
 
-            results.append({
-                'date': date,
-                'stock_value': stock_value,
-                'crypto_value': crypto_value,
-                'bond_value': bond_value,
-                'total_value': total_value
-            })
+        # Bonds: every bond valued over all dates at once
+        bond_values = bond_portfolio.get_values_over_time(dates).to_numpy()
 
-        df = pd.DataFrame(results)
+        total_values = stock_values + crypto_values + bond_values
 
-        if not df.empty:
-            # Calculate returns
-            df['daily_return'] = df['total_value'].pct_change() * 100
-            df['cumulative_return'] = ((df['total_value'] / df['total_value'].iloc[0]) - 1) * 100
+        # Calculate returns (a zero value gives inf/NaN, like pct_change)
+        daily_returns = np.full(len(dates), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            daily_returns[1:] = (total_values[1:] / total_values[:-1] - 1) * 100
+            cumulative_returns = ((total_values / total_values[0]) - 1) * 100
 
-        return df
+        return pd.DataFrame({
+            'date': dates,
+            'stock_value': stock_values,
+            'crypto_value': crypto_values,
+            'bond_value': bond_values,
+            'total_value': total_values,
+            'daily_return': daily_returns,
+            'cumulative_return': cumulative_returns
+        })
 
-    def _calculate_stock_value_at_date(
+    def _get_position_holdings(
         self,
-        portfolio: StockPortfolio,
-        date: str
-    ) -> float:
-        """Calculate stock portfolio value at a specific date"""
-        if not portfolio.positions:
+        portfolio,
+        to_yahoo_symbol: Callable[[str, Dict], str],
+        dates: pd.DatetimeIndex
+    ) -> List[Tuple[str, np.ndarray]]:
+        """
+        Holdings of a portfolio's open positions on every date
+
+        Args:
+            portfolio: StockPortfolio or CryptoPortfolio instance
+            to_yahoo_symbol: Maps (symbol, position) to the Yahoo Finance symbol
+            dates: Valuation dates
+
+        Returns:
+            List of (Yahoo symbol, holdings aligned with dates), in position
+            order, for positions held at some point of the range
+        """
+        # No orders, no positions to build
+        if portfolio.orders.empty:
+            return []
+
+        if not portfolio.positions_fresh():
             portfolio.calculate_positions()
 
-        total_value = 0.0
+        holdings = []
 
         for symbol, pos in portfolio.positions.items():
-            if pos['quantity'] == 0:
+            if pos['quantity'] == 0 or not len(pos['txn_dates']):
                 continue
 
-            # Get holdings at this date
-            holdings_at_date = self._get_holdings_at_date(
-                pos['transactions'], date
-            )
+            quantities = self._get_holdings_series(pos, dates)
+            if quantities.any():
+                holdings.append((to_yahoo_symbol(symbol, pos), quantities))
 
-            if holdings_at_date == 0:
-                continue
+        return holdings
 
-            # Get price at this date
-            yahoo_symbol = portfolio._get_yahoo_symbol(symbol, pos['market'])
-            price = self._get_price_at_date(yahoo_symbol, date)
+    def _sum_position_values(
+        self,
+        holdings: List[Tuple[str, np.ndarray]],
+        prices: Dict[str, np.ndarray],
+        num_dates: int
+    ) -> np.ndarray:
+        """Total value of positions on every date (days without a price add nothing)"""
+        total_values = np.zeros(num_dates)
 
-            if price:
-                total_value += holdings_at_date * price
+        for symbol, quantities in holdings:
+            symbol_prices = prices[symbol]
+            total_values += np.where(np.isnan(symbol_prices), 0.0, quantities * symbol_prices)
 
-        return total_value
+        return total_values
 
-    def _calculate_crypto_value_at_date(
-        self,
-        portfolio: CryptoPortfolio,
-        date: str
-    ) -> float:
-        """Calculate crypto portfolio value at a specific date"""
-        if not portfolio.positions:
-            portfolio.calculate_positions()
+    def _get_holdings_series(self, position: Dict, dates: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Calculate holdings quantity on every date
 
-        total_value = 0.0
+        Args:
+            position: Position with date-ordered txn_dates and txn_holdings arrays
+            dates: Dates to calculate holdings
 
-        for symbol, pos in portfolio.positions.items():
-            if pos['quantity'] == 0:
-                continue
+        Returns:
+            Array of quantities held, aligned with dates
+        """
+        holdings = position['txn_holdings']
 
-            # Get holdings at this date
-            holdings_at_date = self._get_holdings_at_date(
-                pos['transactions'], date
-            )
+        # Index of the last transaction on or before each date (-1 if none yet)
+        last = np.searchsorted(position['txn_dates'], dates.values, side='right') - 1
 
-            if holdings_at_date == 0:
-                continue
+        return np.where(last >= 0, holdings[np.maximum(last, 0)], 0.0)
 
-            # Get price at this date
-            crypto_symbol = f"{symbol}-USD" if not symbol.endswith('-USD') else symbol
-            price = self._get_price_at_date(crypto_symbol, date)
+    def _prefetch_prices(
+        self,
+        holdings: List[Tuple[str, np.ndarray]],
+        dates: pd.DatetimeIndex
+    ) -> Dict[str, np.ndarray]:
+        """
+        Load the price series of every held symbol once
 
-            if price:
-                total_value += holdings_at_date * price
+        Args:
+            holdings: List of (Yahoo symbol, holdings aligned with dates)
+            dates: Valuation dates
 
-        return total_value
+        Returns:
+            Dictionary of price arrays aligned with dates, by symbol
+        """
+        # Prices are needed from the first date each symbol is held
+        first_held = {}
+        for symbol, quantities in holdings:
+            held_from = dates[np.flatnonzero(quantities)[0]]
+            first_held[symbol] = min(first_held.get(symbol, held_from), held_from)
 
-    def _calculate_bond_value_at_date(
-        self,
-        portfolio: BondPortfolio,
-        date: pd.Timestamp
-    ) -> float:
-        """Calculate bond portfolio value at a specific date"""
-        bond_values = portfolio.get_current_values(valuation_date=date)
+        if not first_held:
+            return {}
 
-        if bond_values.empty:
-            return 0.0
+        symbols = list(first_held)
+        start_date = dates[0].strftime('%Y-%m-%d')
+        end_date = dates[-1].strftime('%Y-%m-%d')
+
+        closes = self.historical_manager.get_historical_data_batch(symbols, start_date, end_date)
+
+        # Symbols missing from the database (or at either end of their range)
+        # are fetched once for the whole range, then everything is re-read
+        missing = [
+            (symbol, held_from.strftime('%Y-%m-%d'))
+            for symbol, held_from in first_held.items()
+            if not self._price_coverage_ok(closes[symbol], held_from, dates[-1])
+        ]
 
-        return bond_values['Valor Atual'].sum()
+        if self._fetch_missing_prices(missing, end_date):
+            closes = self.historical_manager.get_historical_data_batch(symbols, start_date, end_date)
 
-    def _get_holdings_at_date(self, transactions: List[Dict], date: str) -> float:
+        # Carry the last close forward over days without one
+        closes = closes.reindex(dates).ffill()
+
+        return {symbol: closes[symbol].to_numpy() for symbol in symbols}
+
+    def _fetch_missing_prices(self, missing: List[Tuple[str, str]], end_date: str) -> bool:
         """
-        Calculate holdings quantity at a specific date
+        Fetch price history for several symbols, concurrently when there are
+        more than one (the requests are network-bound)
 
         Args:
-            transactions: List of transactions
-            date: Date to calculate holdings
+            missing: List of (symbol, start date) to fetch
+            end_date: End date for every fetch
 
         Returns:
-            Quantity held at date
+            True if any fetch stored new data
         """
-        date_ts = pd.Timestamp(date)
-        holdings = 0.0
+        def fetch(item: Tuple[str, str]) -> bool:
+            symbol, start_date = item
+            try:
+                return not self.historical_manager.fetch_historical_data(symbol, start_date, end_date).empty
+            except Exception:
+                return False
 
-        for txn in transactions:
-            if txn['date'] <= date_ts:
-                holdings += txn['quantity']
+        if len(missing) <= 1:
+            return any([fetch(item) for item in missing])
 
-        return holdings
+        with ThreadPoolExecutor(max_workers=min(PRICE_FETCH_WORKERS, len(missing))) as executor:
+            return any(list(executor.map(fetch, missing)))
 
-    def _get_price_at_date(self, symbol: str, date: str) -> float:
-        """Get price for symbol at specific date"""
-        # Try to get from historical database
-        df = self.historical_manager.get_historical_data(symbol, date, date)
-
-        if not df.empty:
-            return float(df.iloc[0]['close'])
-
-        # If not in database, try to fetch
-        try:
-            df = self.historical_manager.fetch_historical_data(
-                symbol,
-                date,
-                date,
-                batch_days=1
-            )
-            if not df.empty:
-                return float(df.iloc[0]['close'])
-        except:
-            pass
+    def _price_coverage_ok(self, closes: pd.Series, needed_from: pd.Timestamp, needed_to: pd.Timestamp) -> bool:
+        """
+        Whether stored closes cover a range, allowing MAX_PRICE_GAP_DAYS
+        missing at either end (weekends and holidays)
+
+        Args:
+            closes: Closing prices indexed by date (NaN where missing)
+            needed_from: First date a price is needed
+            needed_to: Last date a price is needed
+
+        Returns:
+            True if no fetch is needed
+        """
+        first_close = closes.first_valid_index()
+
+        if first_close is None:
+            return False
+
+        max_gap = pd.Timedelta(days=MAX_PRICE_GAP_DAYS)
 
-        return None
+        return first_close <= needed_from + max_gap and closes.last_valid_index() >= needed_to - max_gap
 
     def calculate_risk_metrics(self, performance_df: pd.DataFrame) -> Dict:
         """
@@ -220,87 +286,93 @@ class PortfolioPerformanceCalculator:
         if performance_df.empty or len(performance_df) < 2:
             return {}
 
-        # Daily returns
-        returns = performance_df['daily_return'].dropna()
+        # Daily simple returns (%) as a plain array, without the leading NaN
+        returns_array = performance_df['daily_return'].to_numpy(dtype=np.float64, na_value=np.nan)
+        returns_array = returns_array[~np.isnan(returns_array)]
 
-        if len(returns) == 0:
+        if len(returns_array) == 0:
             return {}
 
         # Annualization factor (252 trading days)
         annual_factor = 252
 
+        # Summary statistics in one pass over the returns
+        mean_return, volatility, downside_std, win_rate, best_day, worst_day = return_stats(returns_array)
+
+        # Both VaR cutoffs from one partition of the returns
+        var_99, var_95 = np.percentile(returns_array, [1, 5])
+        max_drawdown, max_drawdown_pct = self._calculate_max_drawdowns(performance_df['total_value'])
+
         # Calculate metrics
         metrics = {
             # Return metrics
             'total_return_pct': performance_df['cumulative_return'].iloc[-1],
-            'annualized_return': returns.mean() * annual_factor,
+            'annualized_return': mean_return * annual_factor,
 
             # Volatility metrics
-            'volatility_daily': returns.std(),
-            'volatility_annual': returns.std() * np.sqrt(annual_factor),
+            'volatility_daily': volatility,
+            'volatility_annual': volatility * np.sqrt(annual_factor),
 
             # Sharpe ratio (assuming 0% risk-free rate for simplicity)
-            'sharpe_ratio': (returns.mean() * annual_factor) / (returns.std() * np.sqrt(annual_factor))
-            if returns.std() > 0 else 0,
+            'sharpe_ratio': (mean_return * annual_factor) / (volatility * np.sqrt(annual_factor))
+            if volatility > 0 else 0,
 
             # Sortino ratio (downside deviation)
-            'sortino_ratio': self._calculate_sortino_ratio(returns, annual_factor),
+            'sortino_ratio': self._calculate_sortino_ratio(mean_return, downside_std, annual_factor),
 
             # Maximum drawdown
-            'max_drawdown': self._calculate_max_drawdown(performance_df['total_value']),
-            'max_drawdown_pct': self._calculate_max_drawdown_pct(performance_df['total_value']),
+            'max_drawdown': max_drawdown,
+            'max_drawdown_pct': max_drawdown_pct,
 
             # Win rate
-            'win_rate': (returns > 0).sum() / len(returns) * 100,
+            'win_rate': win_rate,
 
             # Best and worst days
-            'best_day': returns.max(),
-            'worst_day': returns.min(),
+            'best_day': best_day,
+            'worst_day': worst_day,
 
             # Calmar ratio (return / max drawdown)
-            'calmar_ratio': self._calculate_calmar_ratio(returns, performance_df['total_value'], annual_factor),
+            'calmar_ratio': self._calculate_calmar_ratio(mean_return, max_drawdown_pct, annual_factor),
 
             # Value at Risk (95%)
-            'var_95': np.percentile(returns, 5),
-            'var_99': np.percentile(returns, 1),
+            'var_95': var_95,
+            'var_99': var_99,
 
             # Conditional VaR (Expected Shortfall)
-            'cvar_95': returns[returns <= np.percentile(returns, 5)].mean(),
-            'cvar_99': returns[returns <= np.percentile(returns, 1)].mean(),
+            'cvar_95': returns_array[returns_array <= var_95].mean(),
+            'cvar_99': returns_array[returns_array <= var_99].mean(),
         }
 
         return metrics
 
-    def _calculate_sortino_ratio(self, returns: pd.Series, annual_factor: int) -> float:
-        """Calculate Sortino ratio (uses only downside volatility)"""
-        downside_returns = returns[returns < 0]
-
-        if len(downside_returns) == 0:
+    def _calculate_sortino_ratio(self, mean_return: float, downside_std: float, annual_factor: int) -> float:
+        """Calculate Sortino ratio (uses only downside volatility, 0 without losses)"""
+        if downside_std == 0:
             return 0.0
 
-        downside_std = downside_returns.std()
+        return (mean_return * annual_factor) / (downside_std * np.sqrt(annual_factor))
 
-        if downside_std == 0:
-            return 0.0
+    def _calculate_drawdowns(self, values: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Running peak, drawdown and drawdown % arrays from one pass over values"""
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        peak = running_peak(values)
+        drawdown = values - peak
 
-        return (returns.mean() * annual_factor) / (downside_std * np.sqrt(annual_factor))
+        # A zero peak gives inf/NaN percentages, which the minimum skips
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown_pct = drawdown / peak * 100
 
-    def _calculate_max_drawdown(self, values: pd.Series) -> float:
-        """Calculate maximum drawdown in absolute terms"""
-        rolling_max = values.expanding().max()
-        drawdown = values - rolling_max
-        return drawdown.min()
+        return peak, drawdown, drawdown_pct
 
-    def _calculate_max_drawdown_pct(self, values: pd.Series) -> float:
-        """Calculate maximum drawdown in percentage"""
-        rolling_max = values.expanding().max()
-        drawdown_pct = ((values - rolling_max) / rolling_max) * 100
-        return drawdown_pct.min()
+    def _calculate_max_drawdowns(self, values: pd.Series) -> Tuple[float, float]:
+        """Calculate maximum drawdown in absolute terms and in percentage"""
+        _, drawdown, drawdown_pct = self._calculate_drawdowns(values)
+        return np.nanmin(drawdown), np.nanmin(drawdown_pct)
 
-    def _calculate_calmar_ratio(self, returns: pd.Series, values: pd.Series, annual_factor: int) -> float:
+    def _calculate_calmar_ratio(self, mean_return: float, max_drawdown_pct: float, annual_factor: int) -> float:
         """Calculate Calmar ratio (annualized return / max drawdown)"""
-        annual_return = returns.mean() * annual_factor
-        max_dd_pct = abs(self._calculate_max_drawdown_pct(values))
+        annual_return = mean_return * annual_factor
+        max_dd_pct = abs(max_drawdown_pct)
 
         if max_dd_pct == 0:
             return 0.0
@@ -317,16 +389,14 @@ class PortfolioPerformanceCalculator:
         Returns:
             DataFrame with drawdown information
         """
-        rolling_max = values.expanding().max()
-        drawdown = values - rolling_max
-        drawdown_pct = ((values - rolling_max) / rolling_max) * 100
+        peak, drawdown, drawdown_pct = self._calculate_drawdowns(values)
 
         return pd.DataFrame({
             'value': values,
-            'peak': rolling_max,
+            'peak': peak,
             'drawdown': drawdown,
             'drawdown_pct': drawdown_pct
-        })
+        }, index=values.index)
 
     def get_rolling_metrics(
         self,
@@ -343,17 +413,17 @@ class PortfolioPerformanceCalculator:
         Returns:
             DataFrame with rolling metrics
         """
-        returns = performance_df['daily_return'].fillna(0)
+        window = performance_df['daily_return'].fillna(0).rolling(window_days)
+
+        # Annualized, each rolling statistic computed once
+        rolling_return = window.mean() * 252
+        rolling_volatility = window.std() * np.sqrt(252)
 
         rolling_metrics = pd.DataFrame({
             'date': performance_df['date'],
-            'rolling_return': returns.rolling(window_days).mean() * 252,  # Annualized
-            'rolling_volatility': returns.rolling(window_days).std() * np.sqrt(252),
-            'rolling_sharpe': (
-                returns.rolling(window_days).mean() * 252
-            ) / (
-                returns.rolling(window_days).std() * np.sqrt(252)
-            )
+            'rolling_return': rolling_return,
+            'rolling_volatility': rolling_volatility,
+            'rolling_sharpe': rolling_return / rolling_volatility
         })
 
         return rolling_metrics
@@ -390,29 +460,28 @@ class PortfolioPerformanceCalculator:
         if benchmark_data.empty:
             return performance_df
 
-        # Merge with performance data
-        comparison = performance_df.copy()
-        comparison['date'] = pd.to_datetime(comparison['date'])
-
-        benchmark_data = benchmark_data.rename(columns={'date': 'date', 'close': 'benchmark_close'})
-        benchmark_data['date'] = pd.to_datetime(benchmark_data['date'])
-
-        comparison = comparison.merge(
-            benchmark_data[['date', 'benchmark_close']],
-            on='date',
-            how='left'
+        # Align benchmark closes to the portfolio dates by index lookup
+        dates = pd.to_datetime(performance_df['date'])
+        benchmark_close = pd.Series(
+            benchmark_data.set_index(pd.to_datetime(benchmark_data['date']))['close']
+            .reindex(dates).to_numpy(),
+            index=performance_df.index
         )
 
         # Calculate benchmark returns
-        if 'benchmark_close' in comparison.columns:
-            comparison['benchmark_return'] = comparison['benchmark_close'].pct_change() * 100
-            comparison['benchmark_cumulative'] = (
-                (comparison['benchmark_close'] / comparison['benchmark_close'].iloc[0]) - 1
-            ) * 100
-
-            # Calculate alpha (portfolio return - benchmark return)
-            comparison['alpha'] = comparison['daily_return'] - comparison['benchmark_return']
-            comparison['cumulative_alpha'] = comparison['cumulative_return'] - comparison['benchmark_cumulative']
+        benchmark_return = benchmark_close.pct_change() * 100
+        benchmark_cumulative = ((benchmark_close / benchmark_close.iloc[0]) - 1) * 100
+
+        # New frame (the input may be a cached history) with alpha as
+        # portfolio return - benchmark return
+        comparison = performance_df.assign(
+            date=dates,
+            benchmark_close=benchmark_close,
+            benchmark_return=benchmark_return,
+            benchmark_cumulative=benchmark_cumulative,
+            alpha=performance_df['daily_return'] - benchmark_return,
+            cumulative_alpha=performance_df['cumulative_return'] - benchmark_cumulative
+        )
 
         return comparison
 